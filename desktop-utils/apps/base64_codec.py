@@ -0,0 +1,327 @@
+import base64
+import hashlib
+import json
+import mimetypes
+import mmap
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+# A multiple of 3 bytes, so only the final chunk ever needs '=' padding and
+# the encoded chunks can simply be concatenated
+CHUNK_SIZE = 3 << 18
+
+
+# Leading bytes of common asset formats, checked in order
+MAGIC_NUMBERS = [
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+    (b"BM", "image/bmp"),
+    (b"\x00\x00\x01\x00", "image/x-icon"),
+    (b"II*\x00", "image/tiff"),
+    (b"MM\x00*", "image/tiff"),
+    (b"wOFF", "font/woff"),
+    (b"wOF2", "font/woff2"),
+    (b"%PDF-", "application/pdf"),
+]
+
+_SLUG = re.compile(r"[^A-Za-z0-9_-]+")
+_NOT_BASE64 = re.compile(rb"[^A-Za-z0-9+/=]")
+_DATA_URI_PREFIX = re.compile(rb"data:[^,]*?;base64,", re.IGNORECASE)
+_CSS_ENTRY = re.compile(r'^    --([A-Za-z0-9_-]+): url\("([^"]*)"\);$', re.MULTILINE)
+
+# What the bundle cache remembers per file; the data URIs themselves are read
+# back from the previous bundle
+_CACHE_FIELDS = ("size", "mtime_ns", "sha256")
+
+
+def base64_length(size):
+    return (size + 2) // 3 * 4
+
+
+def iter_base64_chunks(file_path, chunk_size=CHUNK_SIZE):
+    if chunk_size % 3:
+        raise ValueError("Chunk size must be a multiple of 3 bytes.")
+    with open(file_path, "rb") as source:
+        if os.fstat(source.fileno()).st_size == 0:
+            return
+        with mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            view = memoryview(mm)
+            try:
+                for start in range(0, len(view), chunk_size):
+                    yield base64.b64encode(view[start : start + chunk_size])
+            finally:
+                # The mmap cannot close while a memoryview still exports it
+                view.release()
+
+
+def encode_file_to_buffer(file_path, chunk_size=CHUNK_SIZE):
+    # Fill one preallocated bytearray; joining chunks would need twice the memory
+    buffer = bytearray(base64_length(os.path.getsize(file_path)))
+    view = memoryview(buffer)
+    pos = 0
+    for chunk in iter_base64_chunks(file_path, chunk_size):
+        view[pos : pos + len(chunk)] = chunk
+        pos += len(chunk)
+    view.release()
+    # The file may have shrunk since it was measured
+    del buffer[pos:]
+    return buffer
+
+
+def sniff_mime_type(header, file_path=None):
+    for magic, mime_type in MAGIC_NUMBERS:
+        if header.startswith(magic):
+            return mime_type
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return "image/webp"
+    if header[4:12] in (b"ftypavif", b"ftypavis"):
+        return "image/avif"
+    if b"<svg" in header[:1024]:
+        return "image/svg+xml"
+    if file_path:
+        guessed, _ = mimetypes.guess_type(file_path)
+        if guessed:
+            return guessed
+    return "application/octet-stream"
+
+
+def _encode_data_uri(file_path, previous):
+    # Returns (sha256, data URI). previous is the (sha256, data URI) of the
+    # last build, whose URI is reused when the content hash is unchanged.
+    with open(file_path, "rb") as source:
+        if os.fstat(source.fileno()).st_size == 0:
+            digest = hashlib.sha256().hexdigest()
+            return digest, f"data:{sniff_mime_type(b'', file_path)};base64,"
+        with mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            view = memoryview(mm)
+            try:
+                digest = hashlib.sha256(view).hexdigest()
+                if previous and previous[0] == digest:
+                    return digest, previous[1]
+                mime_type = sniff_mime_type(bytes(view[:1024]), file_path)
+                encoded = base64.b64encode(view).decode("ascii")
+            finally:
+                view.release()
+    return digest, f"data:{mime_type};base64,{encoded}"
+
+
+def bundle_key(relative_path):
+    # CSS custom property name for an asset, e.g. icons/back.png -> back-png
+    return _SLUG.sub("-", relative_path).strip("-").lower()
+
+
+def bundle_keys(relative_paths):
+    # Distinct property names for a whole bundle: paths that slug to the same
+    # name (a.png and a-png) get a numeric suffix in order
+    keys = [bundle_key(relative_path) for relative_path in relative_paths]
+    taken = set(keys)
+    seen = set()
+    unique = {}
+    for relative_path, key in zip(relative_paths, keys):
+        if key in seen:
+            suffix = 2
+            while f"{key}-{suffix}" in taken:
+                suffix += 1
+            key = f"{key}-{suffix}"
+            taken.add(key)
+        seen.add(key)
+        unique[relative_path] = key
+    return unique
+
+
+def _write_bundle(uris, output_path, output_format):
+    with open(output_path, "w", encoding="utf-8") as bundle:
+        if output_format == "json":
+            json.dump(uris, bundle, indent=4)
+        elif output_format == "css":
+            keys = bundle_keys(list(uris))
+            bundle.write(":root {\n")
+            for relative_path, uri in uris.items():
+                bundle.write(f'    --{keys[relative_path]}: url("{uri}");\n')
+            bundle.write("}\n")
+        else:
+            raise ValueError(f"Unsupported bundle format: {output_format}")
+
+
+def _read_bundle(output_path, relative_paths):
+    # Data URIs of the previous bundle by relative path; relative_paths are
+    # the files of that build, in order, to map CSS names back to paths
+    try:
+        with open(output_path, "r", encoding="utf-8") as bundle:
+            text = bundle.read()
+    except (OSError, ValueError):
+        return {}
+    try:
+        uris = json.loads(text)
+    except ValueError:
+        entries = _CSS_ENTRY.findall(text)
+        by_key = dict(entries)
+        if len(by_key) != len(entries):
+            # Written before names were made distinct; encode everything again
+            return {}
+        keys = bundle_keys(relative_paths)
+        return {path: by_key[key] for path, key in keys.items() if key in by_key}
+    return uris if isinstance(uris, dict) else {}
+
+
+def build_data_uri_bundle(folder, output_path, output_format="json", workers=None):
+    # Encode every file under folder into a JSON or CSS bundle of data URIs.
+    # A cache next to the bundle remembers each file's size, mtime and
+    # content hash so unchanged files are copied from the previous bundle
+    # instead of being encoded again on a rerun.
+    cache_path = output_path + ".cache.json"
+    try:
+        with open(cache_path, "r", encoding="utf-8") as cache_file:
+            cache = json.load(cache_file)
+    except (OSError, ValueError):
+        cache = {}
+    previous_uris = _read_bundle(output_path, list(cache))
+
+    skip = {os.path.abspath(output_path), os.path.abspath(cache_path)}
+    files = []
+    for root, dirs, names in os.walk(folder):
+        dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+        for name in sorted(names):
+            path = os.path.join(root, name)
+            if not name.startswith(".") and os.path.abspath(path) not in skip:
+                files.append((os.path.relpath(path, folder).replace(os.sep, "/"), path))
+
+    new_cache = {}
+    found = {}
+    to_encode = []
+    for relative_path, path in files:
+        stat = os.stat(path)
+        cached = cache.get(relative_path) or {}
+        previous_uri = previous_uris.get(relative_path)
+        entry = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        if previous_uri is not None and all(
+            cached.get(k) == v for k, v in entry.items()
+        ):
+            new_cache[relative_path] = {
+                k: cached[k] for k in _CACHE_FIELDS if k in cached
+            }
+            found[relative_path] = previous_uri
+        else:
+            new_cache[relative_path] = entry
+            previous = None
+            if previous_uri is not None:
+                previous = (cached.get("sha256"), previous_uri)
+            to_encode.append((relative_path, path, previous))
+
+    reused = len(files) - len(to_encode)
+    encoded = 0
+    with ThreadPoolExecutor(workers) as executor:
+        results = executor.map(lambda job: _encode_data_uri(job[1], job[2]), to_encode)
+        for (relative_path, _, previous), (digest, uri) in zip(to_encode, results):
+            if previous and previous[0] == digest:
+                reused += 1
+            else:
+                encoded += 1
+            new_cache[relative_path]["sha256"] = digest
+            found[relative_path] = uri
+
+    uris = {relative_path: found[relative_path] for relative_path, _ in files}
+    _write_bundle(uris, output_path, output_format)
+    with open(cache_path, "w", encoding="utf-8") as cache_file:
+        json.dump(new_cache, cache_file)
+    return encoded, reused
+
+
+def iter_file_chunks(file_path, chunk_size=CHUNK_SIZE):
+    with open(file_path, "rb") as source:
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+def iter_text_chunks(text, chunk_size=CHUNK_SIZE):
+    for start in range(0, len(text), chunk_size):
+        yield text[start : start + chunk_size]
+
+
+def _strip_whitespace(chunks):
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            # Non-ASCII characters become '?' and fail validation below
+            chunk = chunk.encode("ascii", errors="replace")
+        chunk = chunk.translate(None, b" \t\r\n")
+        if chunk:
+            yield chunk
+
+
+def _strip_data_uri(chunks):
+    chunks = iter(chunks)
+    head = b""
+    for chunk in chunks:
+        head += chunk
+        if b"," in head or len(head) >= 1024:
+            break
+        if not b"data:".startswith(head[:5].lower()):
+            break
+    match = _DATA_URI_PREFIX.match(head)
+    if match:
+        head = head[match.end() :]
+    elif head[:5].lower() == b"data:":
+        raise ValueError("Only Base64 data URIs can be decoded.")
+    if head:
+        yield head
+    yield from chunks
+
+
+def _base64_blocks(chunks):
+    # Yield runs of Base64 whose length is a multiple of 4, validating the
+    # alphabet and padding as the input arrives
+    pending = b""
+    padded = False
+    position = 0
+    for chunk in _strip_data_uri(_strip_whitespace(chunks)):
+        if padded:
+            raise ValueError(f"Unexpected data after Base64 padding at {position}.")
+        invalid = _NOT_BASE64.search(chunk)
+        if invalid:
+            offset = position + len(pending) + invalid.start()
+            raise ValueError(f"Invalid Base64 character at position {offset}.")
+        pending += chunk
+        cut = len(pending) // 4 * 4
+        block, pending = pending[:cut], pending[cut:]
+        pad = block.find(b"=")
+        if pad != -1:
+            if pad < len(block) - 2 or block[pad:].strip(b"=") or pending:
+                raise ValueError(f"Misplaced Base64 padding at {position + pad}.")
+            padded = True
+        position += len(block)
+        yield block
+    if pending:
+        # Accept input with the trailing padding left off
+        if len(pending) % 4 == 1 or b"=" in pending:
+            raise ValueError("Truncated Base64 input.")
+        yield pending + b"=" * (-len(pending) % 4)
+
+
+def decode_base64_stream(chunks, sink):
+    # Decode Base64 (or a Base64 data URI) chunk by chunk into sink.
+    # Returns the number of bytes written and the sniffed MIME type.
+    written = 0
+    header = b""
+    for block in _base64_blocks(chunks):
+        data = base64.b64decode(block)
+        if len(header) < 1024:
+            header += data[: 1024 - len(header)]
+        sink.write(data)
+        written += len(data)
+    return written, sniff_mime_type(header)
+
+
+def decode_base64_to_file(chunks, output_path):
+    try:
+        with open(output_path, "wb") as sink:
+            return decode_base64_stream(chunks, sink)
+    except ValueError:
+        # Do not leave a partially decoded file behind
+        os.remove(output_path)
+        raise
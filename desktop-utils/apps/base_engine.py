@@ -0,0 +1,599 @@
+import base64
+import csv
+import decimal
+import itertools
+import re
+import string
+from functools import lru_cache
+
+import numpy as np
+
+from apps.batch import BATCH_LINES, convert_lines_file, write_batches
+
+# GMP does huge conversions in near-linear time; it is optional
+try:
+    import gmpy2
+except ImportError:
+    gmpy2 = None
+
+# Digits of the built-in bases 2-36; input in these bases is case-insensitive
+DIGITS = string.digits + string.ascii_uppercase
+
+# Custom alphabets; the base is the alphabet's length
+ALPHABETS = {
+    "Base58": "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz",
+    "Base62": string.digits + string.ascii_uppercase + string.ascii_lowercase,
+}
+
+# Mapping of base names to a radix (2-36) or a custom alphabet
+BASE_MAP = {
+    "Binary": 2,
+    "Octal": 8,
+    "Decimal": 10,
+    "Hexadecimal": 16,
+}
+BASE_MAP.update(
+    {f"Base {radix}": radix for radix in range(2, 37) if radix not in (2, 8, 10, 16)}
+)
+BASE_MAP.update(ALPHABETS)
+
+# Numbers up to these sizes are converted directly; anything larger is split
+# in two by a power of the base, so the work goes into a few big
+# multiplications and divisions instead of one step per digit
+LEAF_DIGITS = 1024
+LEAF_BITS = 2048
+
+# Past this many bits, decimal output goes through the decimal module, whose
+# big multiplications are subquadratic, instead of repeated int division
+DECIMAL_THRESHOLD_BITS = 1 << 16
+
+# Other bases still need big divisions, which the decimal module does in
+# subquadratic time as well; it only pays off for larger numbers
+DECIMAL_DIVISION_THRESHOLD_BITS = 1 << 19
+
+PREFIXES = {2: "0b", 8: "0o", 16: "0x"}
+
+# int() and format() handle power-of-two bases in linear time by regrouping
+# bits; these tables cover the two such bases format() has no code for
+_HEX_TO_BASE4 = str.maketrans(
+    {digit: f"{i >> 2}{i & 3}" for i, digit in enumerate(DIGITS[:16])}
+)
+_RFC_TO_BASE32 = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ234567", DIGITS[:32])
+
+_POWERS = {}
+_DIGIT_VALUES = {}
+
+
+def _alphabet(base):
+    # A base is either a radix for DIGITS or a custom alphabet string
+    if isinstance(base, str):
+        if len(base) < 2 or len(set(base)) != len(base):
+            raise ValueError("An alphabet needs at least two distinct characters.")
+        return len(base), base
+    if not 2 <= base <= 36:
+        raise ValueError(f"Base must be between 2 and 36, not {base}.")
+    return base, DIGITS[:base]
+
+
+def _powers(radix, bits):
+    # radix ** (2 ** i) for i = 0, 1, ..., up to a power with more than
+    # `bits` bits. Built by repeated squaring and kept between calls.
+    powers = _POWERS.setdefault(radix, [radix])
+    while powers[-1].bit_length() <= bits:
+        powers.append(powers[-1] * powers[-1])
+    return powers
+
+
+def _leaf_format(value, radix, alphabet):
+    if alphabet == DIGITS[:radix]:
+        if radix == 10:
+            return str(value)
+        if radix in (2, 8, 16):
+            return format(value, {2: "b", 8: "o", 16: "X"}[radix])
+    digits = []
+    while value:
+        value, digit = divmod(value, radix)
+        digits.append(alphabet[digit])
+    return "".join(reversed(digits)) or alphabet[0]
+
+
+def _format_digits(value, radix, alphabet, width=0):
+    if value.bit_length() <= LEAF_BITS:
+        return _leaf_format(value, radix, alphabet).rjust(width, alphabet[0])
+    powers = _powers(radix, value.bit_length())
+    # The largest radix ** (2 ** i) not above value splits it into halves of
+    # roughly equal size; the low half is padded to exactly 2 ** i digits
+    i = 0
+    while powers[i + 1] <= value:
+        i += 1
+    high, low = divmod(value, powers[i])
+    low_width = 1 << i
+    return _format_digits(
+        high, radix, alphabet, max(width - low_width, 0)
+    ) + _format_digits(low, radix, alphabet, low_width)
+
+
+def _format_power_of_two(value, radix):
+    if radix in (2, 8, 16):
+        return format(value, {2: "b", 8: "o", 16: "X"}[radix])
+    if radix == 4:
+        return format(value, "X").translate(_HEX_TO_BASE4).lstrip("0") or "0"
+    # Base 32: whole 5-byte groups are exactly 8 base32 digits
+    size = -(-value.bit_length() // 40) * 5 or 5
+    digits = base64.b32encode(value.to_bytes(size, "big")).decode("ascii")
+    return digits.translate(_RFC_TO_BASE32).lstrip("0") or "0"
+
+
+def _exact_context():
+    context = decimal.getcontext().copy()
+    context.prec = decimal.MAX_PREC
+    context.Emax = decimal.MAX_EMAX
+    context.Emin = decimal.MIN_EMIN
+    context.traps[decimal.Inexact] = True
+    return context
+
+
+def _to_decimal(value):
+    # Splits by powers of two and rebuilds the number as a Decimal; this is
+    # CPython 3.12's _pylong approach. Runs in an exact context.
+    D = decimal.Decimal
+    powers = {}
+
+    def power_of_two(bits):
+        result = powers.get(bits)
+        if result is None:
+            result = powers[bits] = D(2) ** bits
+        return result
+
+    def inner(n, bits):
+        if bits <= LEAF_BITS:
+            return D(n)
+        half = bits >> 1
+        high = n >> half
+        low = n - (high << half)
+        return inner(high, bits - half) * power_of_two(half) + inner(low, half)
+
+    return inner(value, value.bit_length())
+
+
+def _decimal_string(value):
+    # str() of a Decimal is linear
+    with decimal.localcontext(_exact_context()):
+        return str(_to_decimal(value))
+
+
+def _decimal_digits(value, radix, alphabet):
+    # The split of _format_digits done on Decimals: int division is
+    # quadratic, while the decimal module divides big numbers by Newton
+    # iteration on top of its transform-based multiplication
+    D = decimal.Decimal
+    with decimal.localcontext(_exact_context()):
+        number = _to_decimal(value)
+        powers = [D(radix)]
+        while powers[-1] <= number:
+            powers.append(powers[-1] * powers[-1])
+        leaf = D(2) ** LEAF_BITS
+
+        def inner(n, width):
+            if n < leaf:
+                return _leaf_format(int(n), radix, alphabet).rjust(width, alphabet[0])
+            i = 0
+            while powers[i + 1] <= n:
+                i += 1
+            high, low = divmod(n, powers[i])
+            low_width = 1 << i
+            return inner(high, max(width - low_width, 0)) + inner(low, low_width)
+
+        return inner(number, 0)
+
+
+def _format_positive(value, radix, alphabet):
+    if alphabet == DIGITS[:radix]:
+        if radix & (radix - 1) == 0:
+            return _format_power_of_two(value, radix)
+        if gmpy2 is not None:
+            return gmpy2.mpz(value).digits(radix).upper()
+        if radix == 10 and value.bit_length() > DECIMAL_THRESHOLD_BITS:
+            return _decimal_string(value)
+    if value.bit_length() > DECIMAL_DIVISION_THRESHOLD_BITS:
+        return _decimal_digits(value, radix, alphabet)
+    return _format_digits(value, radix, alphabet)
+
+
+def format_int(value, base=10):
+    radix, alphabet = _alphabet(base)
+    if value < 0:
+        return "-" + _format_positive(-value, radix, alphabet)
+    return _format_positive(value, radix, alphabet)
+
+
+def _digit_values(alphabet):
+    values = _DIGIT_VALUES.get(alphabet)
+    if values is None:
+        values = _DIGIT_VALUES[alphabet] = {c: i for i, c in enumerate(alphabet)}
+    return values
+
+
+def _leaf_parse(digits, radix, alphabet):
+    if alphabet == DIGITS[:radix]:
+        return int(digits, radix)
+    value = 0
+    index = _digit_values(alphabet)
+    for char in digits:
+        value = value * radix + index[char]
+    return value
+
+
+def _parse_digits(digits, radix, alphabet):
+    if len(digits) <= LEAF_DIGITS:
+        return _leaf_parse(digits, radix, alphabet)
+    # Split off the low 2 ** i digits, the largest such block that leaves a
+    # non-empty high part
+    i = (len(digits) - 1).bit_length() - 1
+    low_width = 1 << i
+    powers = _powers(radix, low_width * radix.bit_length())
+    high = _parse_digits(digits[:-low_width], radix, alphabet)
+    low = _parse_digits(digits[-low_width:], radix, alphabet)
+    return high * powers[i] + low
+
+
+_SEPARATORS = re.compile(r"[\s_]+")
+
+
+def parse_int(text, base=10):
+    # Accepts an optional sign and, for the built-in bases, the 0b/0o/0x
+    # prefix, underscores and spaces between digits, in either case
+    radix, alphabet = _alphabet(base)
+    text = text.strip()
+    negative = text.startswith("-")
+    if text[:1] in "+-":
+        text = text[1:]
+    if alphabet == DIGITS[:radix]:
+        text = _SEPARATORS.sub("", text).upper()
+        prefix = PREFIXES.get(radix, "").upper()
+        if prefix and text.startswith(prefix):
+            text = text[len(prefix) :]
+    if not text:
+        raise ValueError("No digits to convert.")
+    invalid = text.translate(dict.fromkeys(map(ord, alphabet)))
+    if invalid:
+        raise ValueError(f"Invalid digit {invalid[0]!r} for base {radix}.")
+    if alphabet != DIGITS[:radix]:
+        value = _parse_digits(text, radix, alphabet)
+    elif radix & (radix - 1) == 0:
+        value = int(text, radix)
+    elif gmpy2 is not None:
+        value = int(gmpy2.mpz(text, radix))
+    else:
+        value = _parse_digits(text, radix, alphabet)
+    return -value if negative else value
+
+
+def convert_number(num_str, from_base, to_base):
+    # The built-in binary, octal and hex keep their usual Python prefixes
+    value = parse_int(num_str, from_base)
+    result = format_int(abs(value), to_base)
+    if isinstance(to_base, int) and to_base in PREFIXES:
+        result = PREFIXES[to_base] + result
+    return "-" + result if value < 0 else result
+
+
+def _digit_count(value, radix):
+    digits = 1
+    while value >= radix:
+        value //= radix
+        digits += 1
+    return digits
+
+
+def _digit_lookup(radix, alphabet):
+    # Code point -> digit value; 255 marks characters outside the alphabet
+    lookup = np.full(256, 255, dtype=np.uint8)
+    for value, char in enumerate(alphabet):
+        lookup[ord(char)] = value
+        if alphabet == DIGITS[:radix]:
+            lookup[ord(char.lower())] = value
+    return lookup
+
+
+def _parse_uint64(lines, radix, alphabet):
+    # Vectorized parse of short, plain numbers (optional sign and prefix).
+    # Returns magnitudes, a negative mask and a mask of the rows handled;
+    # the other rows are left for parse_int.
+    # Enough digits for any 64-bit value; longer input may still fit if it
+    # has leading zeros, but that is left to parse_int
+    max_digits = _digit_count((1 << 64) - 1, radix)
+    prefix = PREFIXES.get(radix, "") if alphabet == DIGITS[:radix] else ""
+    width = max_digits + 1 + len(prefix)
+    lengths = np.fromiter(map(len, lines), dtype=np.int64, count=len(lines))
+    handled = (lengths > 0) & (lengths <= width)
+    rows = np.flatnonzero(handled)
+    text = np.array([lines[i] for i in rows], dtype=f"U{width}")
+    codes = text.view(np.uint32).reshape(len(rows), width)
+    codes = np.minimum(codes, 255).astype(np.uint8)
+    lengths = lengths[rows]
+
+    first = codes[:, 0]
+    negative = first == ord("-")
+    signed = negative | (first == ord("+"))
+    codes[signed, 0] = ord(alphabet[0])
+    digit_count = lengths - signed
+    if prefix:
+        start = signed.astype(np.int64)
+        zero = np.take_along_axis(codes, start[:, None], 1)[:, 0] == ord("0")
+        mark = np.take_along_axis(codes, start[:, None] + 1, 1)[:, 0]
+        prefixed = zero & ((mark == ord(prefix[1])) | (mark == ord(prefix[1].upper())))
+        codes[prefixed, start[prefixed] + 1] = ord("0")
+        digit_count -= 2 * prefixed
+
+    digits = _digit_lookup(radix, alphabet)[codes]
+    in_number = np.arange(width) < lengths[:, None]
+    valid = ~((digits == 255) & in_number).any(axis=1)
+    valid &= (digit_count > 0) & (digit_count <= max_digits)
+
+    # Horner's rule a column at a time over all but each row's last digit,
+    # which cannot pass 2 ** 64 - 1; rows that would overflow on the last
+    # step are handed back to parse_int
+    values = np.zeros(len(rows), dtype=np.uint64)
+    base = np.uint64(radix)
+    last_column = lengths - 1
+    for column in range(width - 1):
+        step = valid & (column < last_column)
+        np.multiply(values, base, out=values, where=step)
+        np.add(values, digits[:, column], out=values, where=step, casting="unsafe")
+    last = digits[np.arange(len(rows)), last_column].astype(np.uint64)
+    last[~valid] = 0
+    valid &= values <= (np.uint64((1 << 64) - 1) - last) // base
+    values = values * base + last
+    handled[rows[~valid]] = False
+    return values[valid], negative[valid], handled
+
+
+def _digit_matrix(values, radix):
+    # Right-aligned digits of uint64 values, one row each, and the column of
+    # each row's first significant digit (every number keeps its last one)
+    width = _digit_count(int(values.max()) if len(values) else 0, radix)
+    # Digit positions are filled as contiguous rows, then transposed
+    digits = np.zeros((width, len(values)), dtype=np.uint8)
+    values = values.astype(np.uint64)
+    remaining = values.copy()
+    base = np.uint64(radix)
+    bits = np.uint64(radix.bit_length() - 1)
+    for position in range(width - 1, -1, -1):
+        if not remaining.any():
+            break
+        if radix & (radix - 1) == 0:
+            np.bitwise_and(
+                remaining, base - np.uint64(1), out=digits[position], casting="unsafe"
+            )
+            remaining >>= bits
+        else:
+            remaining, digits[position] = np.divmod(remaining, base)
+    # Digit counts from comparisons with powers of the radix, which is
+    # cheaper than scanning the transposed matrix
+    counts = np.ones(len(values), dtype=np.int64)
+    for exponent in range(1, width):
+        counts += values >= np.uint64(radix**exponent)
+    return digits.T, width - counts
+
+
+def _format_uint64(values, negative, radix, alphabet):
+    # Vectorized inverse of _parse_uint64, with the same prefixes and sign
+    # as convert_number; returns one string per value
+    digits, leading = _digit_matrix(values, radix)
+    width = digits.shape[1]
+    prefix = PREFIXES.get(radix, "") if alphabet == DIGITS[:radix] else ""
+    table = np.frombuffer(alphabet.encode("ascii"), dtype=np.uint8)
+    columns = [
+        np.full((len(values), 1), ord("-"), dtype=np.uint8),
+        np.tile(
+            np.frombuffer(prefix.encode("ascii"), dtype=np.uint8), (len(values), 1)
+        ),
+        table[digits],
+        np.full((len(values), 1), ord("\n"), dtype=np.uint8),
+    ]
+    keep = [
+        (negative & (values != 0))[:, None],
+        np.ones((len(values), len(prefix)), dtype=bool),
+        np.arange(width) >= leading[:, None],
+        np.ones((len(values), 1), dtype=bool),
+    ]
+    # Boolean indexing reads row by row, so the kept characters come out as
+    # the finished lines
+    text = np.hstack(columns)[np.hstack(keep)].tobytes().decode("ascii")
+    return text.split("\n")[:-1]
+
+
+@lru_cache(maxsize=128)
+def cached_convert(num_str, from_base, to_base):
+    # Memoized per (input, from base, target base) for live conversion, so
+    # retyping or switching back to a recent input costs nothing
+    return convert_number(num_str, from_base, to_base)
+
+
+def convert_number_lines(lines, from_base, to_base, first_line=1):
+    # Convert one number per line. Returns the converted lines and (line
+    # number, message) pairs; a line that fails is passed through unchanged.
+    # Numbers that fit in 64 bits go through NumPy, the rest one by one.
+    from_radix, from_alphabet = _alphabet(from_base)
+    to_radix, to_alphabet = _alphabet(to_base)
+    converted = list(lines)
+    handled = np.zeros(len(lines), dtype=bool)
+    if lines and from_alphabet.isascii() and to_alphabet.isascii():
+        values, negative, handled = _parse_uint64(lines, from_radix, from_alphabet)
+        results = _format_uint64(values, negative, to_radix, to_alphabet)
+        if handled.all():
+            converted = results
+        else:
+            for index, result in zip(np.flatnonzero(handled).tolist(), results):
+                converted[index] = result
+    errors = []
+    for index in np.flatnonzero(~handled).tolist():
+        try:
+            converted[index] = convert_number(lines[index], from_base, to_base)
+        except ValueError as e:
+            errors.append((first_line + index, str(e)))
+    return converted, errors
+
+
+def convert_number_file(input_path, output_path, from_base, to_base, column=None):
+    # One number per line, or, when column is given, a CSV file whose column
+    # gets a converted copy appended as "<column> converted". Returns (count,
+    # error count, reported errors) with line numbers as in the input file.
+    if column is None:
+        return convert_lines_file(
+            input_path,
+            output_path,
+            lambda lines, first_line: convert_number_lines(
+                lines, from_base, to_base, first_line
+            ),
+        )
+    with open(input_path, "r", encoding="utf-8", newline="") as input_file, open(
+        output_path, "w", encoding="utf-8", newline=""
+    ) as output_file:
+        reader = csv.reader(input_file)
+        writer = csv.writer(output_file)
+        header = next(reader, None)
+        if header is None or column not in header:
+            raise ValueError(f"Column {column!r} not found in the CSV header.")
+        index = header.index(column)
+        writer.writerow(header + [f"{column} converted"])
+
+        def converted_rows():
+            first_line = 2
+            while True:
+                rows = list(itertools.islice(reader, BATCH_LINES))
+                if not rows:
+                    return
+                values = [row[index] if index < len(row) else "" for row in rows]
+                converted, errors = convert_number_lines(
+                    values, from_base, to_base, first_line
+                )
+                yield [row + [value] for row, value in zip(rows, converted)], errors
+                first_line += len(rows)
+
+        return write_batches(converted_rows(), writer.writerows)
+
+
+# Fixed-width views: word sizes offered, and those with an IEEE-754 format
+WORD_BITS = (8, 16, 32, 64)
+FLOAT_BITS = (16, 32, 64)
+BYTE_ORDERS = {"Big-endian": "big", "Little-endian": "little"}
+
+
+def fixed_width_views(value, bits):
+    # One value as an N-bit word: its two's-complement bytes are read once
+    # and reinterpreted through NumPy views over the same buffer
+    if not -(1 << (bits - 1)) <= value < 1 << bits:
+        raise ValueError(f"{value} does not fit in {bits} bits.")
+    size = bits // 8
+    data = (value & ((1 << bits) - 1)).to_bytes(size, "big")
+    views = [
+        ("Unsigned", str(np.frombuffer(data, dtype=f">u{size}")[0])),
+        ("Signed", str(np.frombuffer(data, dtype=f">i{size}")[0])),
+        ("Hex", "0x" + data.hex().upper()),
+        ("Binary", " ".join(f"{byte:08b}" for byte in data)),
+        ("Big-endian bytes", data.hex(" ").upper()),
+        ("Little-endian bytes", data[::-1].hex(" ").upper()),
+    ]
+    if bits in FLOAT_BITS:
+        # NumPy prints the shortest repr for the float's own precision
+        views.append(
+            (f"IEEE-754 float{bits}", str(np.frombuffer(data, dtype=f">f{size}")[0]))
+        )
+    return views
+
+
+def parse_hex_blob(text):
+    # A hex dump as bytes; whitespace, underscores and 0x prefixes are ignored
+    return bytes.fromhex(_SEPARATORS.sub("", text).replace("0x", "").replace("0X", ""))
+
+
+def _text_column(strings):
+    # Fixed-width byte strings (NumPy "S" array) as a uint8 matrix, cut to
+    # the longest entry and padded with spaces
+    matrix = strings.view(np.uint8).reshape(len(strings), strings.dtype.itemsize)
+    used = np.flatnonzero((matrix != 0).any(axis=0))
+    matrix = matrix[:, : used[-1] + 1 if len(used) else 0].copy()
+    matrix[matrix == 0] = ord(" ")
+    return matrix
+
+
+def _decimal_column(words):
+    # Right-aligned decimal text of integer words, with the minus sign just
+    # before the first digit
+    negative = words < 0
+    if words.dtype.kind == "i":
+        # abs() wraps the most negative word, which uint64 reads correctly
+        words = np.abs(words.astype(np.int64))
+    digits, leading = _digit_matrix(words.astype(np.uint64), 10)
+    width = digits.shape[1]
+    # Column 0 is room for the sign of the longest numbers
+    matrix = np.empty((len(words), width + 1), dtype=np.uint8)
+    matrix[:, 0] = ord(" ")
+    np.add(digits, ord("0"), out=matrix[:, 1:], casting="unsafe")
+    matrix[:, 1:][np.arange(width) < leading[:, None]] = ord(" ")
+    rows = np.flatnonzero(negative)
+    matrix[rows, leading[rows]] = ord("-")
+    used = np.flatnonzero((matrix != ord(" ")).any(axis=0))
+    return matrix[:, used[0] if len(used) else matrix.shape[1] :]
+
+
+def _hex_strings(words, size):
+    # Zero-padded hex of every word from one bytes.hex() call
+    digits = words.astype(f">u{size}").tobytes().hex().upper()
+    return np.frombuffer(digits.encode("ascii"), dtype=f"S{2 * size}")
+
+
+def word_table(data, bits, byteorder="big"):
+    # Decode raw bytes into a text table of N-bit words (offset, hex,
+    # unsigned, signed and float). Every column is formatted by NumPy and
+    # the rows are assembled as one byte matrix.
+    size = bits // 8
+    if len(data) % size:
+        raise ValueError(
+            f"{len(data)} bytes is not a whole number of {bits}-bit words."
+        )
+    order = ">" if byteorder == "big" else "<"
+    unsigned = np.frombuffer(data, dtype=f"{order}u{size}")
+    count = len(unsigned)
+    columns = [
+        ("Offset", _text_column(_hex_strings(np.arange(0, len(data), size), 4))),
+        ("Hex", _text_column(_hex_strings(unsigned, size))),
+        ("Unsigned", _decimal_column(unsigned)),
+        ("Signed", _decimal_column(unsigned.view(f"{order}i{size}"))),
+    ]
+    if bits in FLOAT_BITS:
+        # Shortest round-trip repr per value; the slowest column by far
+        floats = np.frombuffer(data, dtype=f"{order}f{size}")
+        columns.append(("Float", _text_column(floats.astype("S32"))))
+
+    headers = []
+    matrices = []
+    for header, matrix in columns:
+        width = max(matrix.shape[1], len(header))
+        padding = np.full((count, width - matrix.shape[1] + 2), ord(" "), np.uint8)
+        matrices.extend([matrix, padding])
+        headers.append(header.ljust(width + 2))
+    matrices[-1] = np.full((count, 1), ord("\n"), np.uint8)
+    body = np.hstack(matrices).tobytes().decode("ascii")
+    return "".join(headers).rstrip() + "\n" + body
+
+
+def fixed_width_text(num_str, from_base, bits):
+    views = fixed_width_views(parse_int(num_str, from_base), bits)
+    width = max(len(label) for label, _ in views) + 2
+    return "\n".join(label.ljust(width) + text for label, text in views)
+
+
+def hex_word_table(hex_text, bits, byteorder="big"):
+    return word_table(parse_hex_blob(hex_text), bits, byteorder)
+
+
+def hex_file_word_table(input_path, output_path, bits, byteorder="big"):
+    # A hex dump file to a word table file; returns the number of words
+    with open(input_path, "r", encoding="ascii") as hex_file:
+        data = parse_hex_blob(hex_file.read())
+    with open(output_path, "w", encoding="ascii", newline="\n") as table_file:
+        table_file.write(word_table(data, bits, byteorder))
+    return len(data) // (bits // 8)
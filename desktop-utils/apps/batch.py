@@ -0,0 +1,61 @@
+import itertools
+
+# Lines converted together in batch mode
+BATCH_LINES = 200000
+
+# Only the first errors are kept with their messages; the rest are counted
+MAX_REPORTED_ERRORS = 1000
+
+
+def line_batches(text_file, batch_lines=BATCH_LINES):
+    # Yields (lines without their line endings, number of the first line)
+    first_line = 1
+    while True:
+        lines = [
+            line.rstrip("\r\n") for line in itertools.islice(text_file, batch_lines)
+        ]
+        if not lines:
+            return
+        yield lines, first_line
+        first_line += len(lines)
+
+
+def write_batches(results, write_batch):
+    # Consumes (converted, errors) pairs in input order: every converted batch
+    # is written, errors are counted and the first ones kept. Returns (count,
+    # error count, reported errors).
+    total = 0
+    error_count = 0
+    reported = []
+    for converted, errors in results:
+        write_batch(converted)
+        total += len(converted)
+        error_count += len(errors)
+        reported.extend(errors[: MAX_REPORTED_ERRORS - len(reported)])
+    return total, error_count, reported
+
+
+def convert_lines_file(
+    input_path,
+    output_path,
+    convert_lines,
+    map_batches=itertools.starmap,
+    batch_lines=BATCH_LINES,
+    errors="strict",
+):
+    # One value per line. convert_lines(lines, first_line) returns the
+    # converted lines, with failing lines copied unchanged, and a list of
+    # (line number, message). map_batches(convert_lines, batches) may hand
+    # the batches to worker processes as long as results come back in order.
+    with open(
+        input_path, "r", encoding="utf-8", errors=errors, newline=""
+    ) as input_file, open(
+        output_path, "w", encoding="utf-8", errors=errors, newline=""
+    ) as output_file:
+
+        def write_lines(converted):
+            output_file.write("\n".join(converted))
+            output_file.write("\n")
+
+        batches = line_batches(input_file, batch_lines)
+        return write_batches(map_batches(convert_lines, batches), write_lines)
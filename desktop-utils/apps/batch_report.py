@@ -0,0 +1,20 @@
+from PyQt5.QtWidgets import QMessageBox
+
+# Failing lines listed in the warning dialog
+SHOWN_ERRORS = 20
+
+
+def report_batch(parent, status_label, noun, total, error_count, errors):
+    # Shows the (count, error count, reported errors) result of a batch
+    # conversion in the tool's status label, with a warning listing failures
+    status = f"Converted {total - error_count:,} {noun}."
+    if error_count:
+        status += (
+            f" {error_count:,} lines could not be converted"
+            " and were copied unchanged."
+        )
+        details = "\n".join(
+            f"Line {number}: {message}" for number, message in errors[:SHOWN_ERRORS]
+        )
+        QMessageBox.warning(parent, "Batch Conversion", f"{status}\n\n{details}")
+    status_label.setText(status)
@@ -0,0 +1,756 @@
+import collections
+import functools
+import math
+import warnings
+
+import numpy as np
+
+from apps.batch import convert_lines_file
+
+# Palette extraction: colors by default, pixels clustered at most, and the
+# fixed number of k-means rounds after the median-cut seeding
+PALETTE_SIZE = 6
+PALETTE_PIXELS = 1 << 16
+KMEANS_ITERATIONS = 8
+
+
+def _hex_values(hex_str):
+    hex_str = hex_str.strip().lstrip("#")
+    if len(hex_str) != 6:
+        raise ValueError("HEX color must be 6 characters long.")
+    try:
+        r = int(hex_str[0:2], 16)
+        g = int(hex_str[2:4], 16)
+        b = int(hex_str[4:6], 16)
+    except Exception as e:
+        raise ValueError("Invalid HEX color code.") from e
+    return r, g, b
+
+
+def _rgb_values(rgb_str):
+    # Expecting input as "r, g, b" or "r g b"
+    parts = (
+        rgb_str.replace("(", "")
+        .replace(")", "")
+        .replace("rgb", "")
+        .replace(",", " ")
+        .split()
+    )
+    if len(parts) != 3:
+        raise ValueError("RGB input must have three components.")
+    try:
+        r, g, b = [int(part) for part in parts]
+        if not all(0 <= x <= 255 for x in [r, g, b]):
+            raise ValueError("RGB values must be in the range 0-255.")
+    except Exception as e:
+        raise ValueError("Invalid RGB input.") from e
+    return r, g, b
+
+
+def hex_to_rgb(hex_str):
+    r, g, b = _hex_values(hex_str)
+    return f"rgb({r}, {g}, {b})"
+
+
+def rgb_to_hex(rgb_str):
+    r, g, b = _rgb_values(rgb_str)
+    return f"#{r:02X}{g:02X}{b:02X}"
+
+
+# Value of each character code as a hex digit, 255 where it is not one
+_HEX_VALUES = np.full(256, 255, dtype=np.uint8)
+for _i, _digit in enumerate("0123456789ABCDEF"):
+    _HEX_VALUES[ord(_digit)] = _HEX_VALUES[ord(_digit.lower())] = _i
+
+# "#RRGGBB" pieces: the two upper-case hex digits of every byte value
+_HEX_PAIRS = np.frombuffer(
+    "".join(f"{i:02X}" for i in range(256)).encode("ascii"), dtype=np.uint8
+).reshape(256, 2)
+
+# Decimal digits of every byte value, right-aligned in three columns and
+# padded with NUL bytes that are dropped when the lines are assembled
+_DECIMAL_DIGITS = np.frombuffer(
+    "".join(f"{i:>3}" for i in range(256)).replace(" ", "\0").encode("ascii"),
+    dtype=np.uint8,
+).reshape(256, 3)
+
+# Zero-padded four-digit groups, for numbers of any size
+_PADDED_DIGITS = np.frombuffer(
+    "".join(f"{i:04d}" for i in range(10000)).encode("ascii"), dtype=np.uint8
+).reshape(10000, 4)
+
+# Characters str.split() treats as whitespace in ASCII text
+_SPACE = np.zeros(256, dtype=bool)
+_SPACE[list(b" \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f")] = True
+
+# _rgb_values' separators: commas count as spaces
+_RGB_SEPARATORS = bytes.maketrans(b",", b" ")
+
+
+def _ascii_rows(text_rows, width):
+    # Fixed-width rows of character codes; short rows are NUL-padded
+    return np.array(text_rows, dtype=f"U{width}").view(np.uint32).reshape(-1, width)
+
+
+def _fromhex_colors(hex_text, count):
+    # One C-level pass over the whole batch; a stray whitespace or non-hex
+    # character makes fromhex fail or come up short
+    try:
+        data = bytes.fromhex(hex_text)
+    except ValueError:
+        return None
+    if len(data) != 3 * count:
+        return None
+    return np.frombuffer(data, dtype=np.uint8).reshape(count, 3)
+
+
+def _parse_hex_colors(lines):
+    # Returns an (n, 3) uint8 array of colors and a mask of the lines that
+    # parsed; the others are left to _hex_values for their error message
+    count = len(lines)
+    lengths = np.fromiter(map(len, lines), dtype=np.int64, count=count)
+    joined = "".join(lines)
+    # Usual case: every line is exactly "#RRGGBB" (or "RRGGBB")
+    colors = None
+    if (lengths == 7).all() and joined[::7] == "#" * count:
+        colors = _fromhex_colors(joined.replace("#", ""), count)
+    elif (lengths == 6).all():
+        colors = _fromhex_colors(joined, count)
+    if colors is not None:
+        return colors, np.ones(count, dtype=bool)
+
+    cleaned = [line.strip().lstrip("#") for line in lines]
+    lengths = np.fromiter(map(len, cleaned), dtype=np.int64, count=count)
+    if (lengths == 6).all():
+        colors = _fromhex_colors("".join(cleaned), count)
+        if colors is not None:
+            return colors, np.ones(count, dtype=bool)
+    codes = _ascii_rows(cleaned, 6)
+    digits = _HEX_VALUES[np.minimum(codes, 255)]
+    digits[codes > 255] = 255
+    valid = (lengths == 6) & (digits != 255).all(axis=1)
+    digits[~valid] = 0
+    colors = (digits[:, 0::2] << 4) | digits[:, 1::2]
+    return colors, valid
+
+
+def _format_hex_colors(colors):
+    # "#RRGGBB" for each row, built as one byte matrix from the pair table
+    count = len(colors)
+    if not count:
+        return []
+    out = np.empty((count, 8), dtype=np.uint8)
+    out[:, 0] = ord("#")
+    out[:, 1:7] = _HEX_PAIRS[colors].reshape(count, 6)
+    out[:, 7] = ord("\n")
+    return out.tobytes().decode("ascii").split("\n")[:-1]
+
+
+def _format_rgb_colors(colors):
+    # "rgb(r, g, b)" for each row: fixed-width columns from the digit table,
+    # then the NUL padding of short numbers is dropped in one mask
+    count = len(colors)
+    if not count:
+        return []
+    out = np.zeros((count, 19), dtype=np.uint8)
+    out[:, 0:4] = np.frombuffer(b"rgb(", dtype=np.uint8)
+    out[:, 4:7] = _DECIMAL_DIGITS[colors[:, 0]]
+    out[:, 7:9] = np.frombuffer(b", ", dtype=np.uint8)
+    out[:, 9:12] = _DECIMAL_DIGITS[colors[:, 1]]
+    out[:, 12:14] = np.frombuffer(b", ", dtype=np.uint8)
+    out[:, 14:17] = _DECIMAL_DIGITS[colors[:, 2]]
+    out[:, 17] = ord(")")
+    out[:, 18] = ord("\n")
+    return out[out != 0].tobytes().decode("ascii").split("\n")[:-1]
+
+
+def _tokens(raw):
+    # Whitespace-separated tokens of ASCII text: the bytes, their whitespace
+    # mask and line numbers, and the offsets where tokens start and end
+    data = np.frombuffer(raw, dtype=np.uint8)
+    space = _SPACE[data]
+    starts = ~space
+    starts[1:] &= space[:-1]
+    ends = ~space
+    ends[:-1] &= space[1:]
+    line_ids = np.cumsum(data == ord("\n"), dtype=np.int32)
+    return data, space, line_ids, np.flatnonzero(starts), np.flatnonzero(ends)
+
+
+def _parse_rgb_colors(lines):
+    # Vectorized _rgb_values parsing for ASCII input: the same clean-up on the
+    # whole batch, tokens found from the whitespace mask, then each token's
+    # last four characters read as digits. Returns the colors and a mask of
+    # the lines that parsed; anything unusual (long or malformed numbers) is
+    # left to _rgb_values.
+    count = len(lines)
+    colors = np.zeros((count, 3), dtype=np.uint8)
+    # Non-ASCII characters become "?", which fails the lines they are on.
+    # Dropping the parentheses before "rgb" and turning commas into spaces
+    # after it matches _rgb_values' order of replacements.
+    raw = "\n".join(lines).encode("ascii", "replace")
+    raw = raw.translate(_RGB_SEPARATORS, b"()").replace(b"rgb", b"")
+    data, space, line_ids, start_index, end_index = _tokens(raw)
+    token_lines = line_ids[start_index]
+
+    # Up to four characters per token, right-aligned; earlier slots are blank
+    window = end_index[:, None] - np.arange(3, -1, -1)
+    inside = window >= start_index[:, None]
+    chars = np.where(inside, data[np.maximum(window, 0)], ord("0"))
+    first = data[start_index]
+    signed = (first == ord("+")) | (first == ord("-"))
+    # A leading sign reads as a zero digit and is applied afterwards
+    rows = np.arange(len(chars))
+    first_slot = 3 - (end_index - start_index).clip(max=3)
+    chars[rows[signed], first_slot[signed]] = ord("0")
+    # A line parses if it has three tokens of at most four characters, all
+    # digits apart from an optional leading sign
+    good = (end_index - start_index <= 3) & (
+        (chars >= ord("0")) & (chars <= ord("9"))
+    ).all(axis=1)
+    good &= ~signed | (end_index > start_index)
+    valid = (np.bincount(token_lines, minlength=count) == 3) & (
+        np.bincount(token_lines[~good], minlength=count) == 0
+    )
+    if not valid.any():
+        return colors, valid
+    values = (chars - ord("0")).astype(np.int64) @ np.array([1000, 100, 10, 1])
+    values[first == ord("-")] *= -1
+    values = values[valid[token_lines]].reshape(-1, 3)
+    in_range = ((values >= 0) & (values <= 255)).all(axis=1)
+    valid[valid] = in_range
+    colors[valid] = values[in_range]
+    return colors, valid
+
+
+# Characters a float token may contain once the text is lower-cased
+_FLOAT_CHARS = np.zeros(256, dtype=bool)
+_FLOAT_CHARS[list(b"0123456789+-.e")] = True
+
+# Separators of the numeric color notations: commas and slashes count as
+# spaces; parentheses and percent signs are dropped
+_NUMBER_SEPARATORS = bytes.maketrans(b",/", b"  ")
+_NUMBER_TABLE = str.maketrans({",": " ", "/": " ", "(": None, ")": None, "%": None})
+
+
+def _number_values(text, name, label, ranges):
+    # Per-line parser of "name(a, b%, c%)" style colors; the reference for
+    # what _parse_number_colors accepts, and the source of its errors
+    parts = text.lower().translate(_NUMBER_TABLE).replace(name, "").split()
+    if len(parts) != len(ranges):
+        raise ValueError(f"{label} input must have {len(ranges)} components.")
+    try:
+        values = [float(part) for part in parts]
+    except ValueError as e:
+        raise ValueError(f"Invalid {label} input.") from e
+    for value, (low, high) in zip(values, ranges):
+        if not math.isfinite(value):
+            raise ValueError(f"{label} components must be finite numbers.")
+        if not low <= value <= high:
+            raise ValueError(
+                f"{label} value {value:g} is outside the range {low:g}-{high:g}."
+            )
+    return values
+
+
+def _fromstring(text):
+    # fromstring only warns when it stops early; that is an error here
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        try:
+            return np.fromstring(text, sep=",")
+        except (ValueError, DeprecationWarning):
+            return np.empty(0)
+
+
+def _parse_floats(rows, size):
+    # One fromstring call over rows of size tokens each. With commas as the
+    # only separator every token must parse whole, so a malformed number
+    # stops the parse instead of splitting in two. A failing batch is halved
+    # until the bad rows are isolated. Returns the numbers and a mask of the
+    # rows that parsed.
+    numbers = _fromstring(b",".join(b" ".join(rows).split()))
+    if len(numbers) == size * len(rows):
+        return numbers.reshape(-1, size), np.ones(len(rows), dtype=bool)
+    if len(rows) == 1:
+        return np.zeros((1, size)), np.zeros(1, dtype=bool)
+    middle = len(rows) // 2
+    first, first_parsed = _parse_floats(rows[:middle], size)
+    second, second_parsed = _parse_floats(rows[middle:], size)
+    return np.vstack([first, second]), np.concatenate([first_parsed, second_parsed])
+
+
+def _parse_number_colors(lines, name, label, ranges):
+    # Vectorized _number_values: the same clean-up on the whole batch,
+    # component counts from the whitespace mask and one NumPy float parse of
+    # every line that looks numeric. Non-ASCII characters become "?", which
+    # fails the lines they are on. Returns the values and a mask of the
+    # lines that parsed.
+    count = len(lines)
+    size = len(ranges)
+    values = np.zeros((count, size))
+    raw = "\n".join(lines).lower().encode("ascii", "replace")
+    raw = raw.translate(_NUMBER_SEPARATORS, b"()%").replace(name.encode("ascii"), b"")
+    data, space, line_ids, start_index, _ = _tokens(raw)
+    valid = (np.bincount(line_ids[start_index], minlength=count) == size) & (
+        np.bincount(line_ids[~space & ~_FLOAT_CHARS[data]], minlength=count) == 0
+    )
+    if not valid.any():
+        return values, valid
+    # Tokens of the candidate lines with exactly one comma between them:
+    # the first whitespace byte after each token becomes the comma
+    keep = ~space
+    keep[1:] |= ~space[:-1]
+    keep &= valid[line_ids]
+    numbers = _fromstring(np.where(space, ord(","), data)[keep].tobytes().rstrip(b","))
+    if len(numbers) == size * valid.sum():
+        numbers, parsed = numbers.reshape(-1, size), np.ones(valid.sum(), dtype=bool)
+    else:
+        rows = np.array(raw.split(b"\n"), dtype=object)[valid]
+        numbers, parsed = _parse_floats(rows, size)
+    valid[valid] = parsed
+    numbers = numbers[parsed]
+    low, high = np.array(ranges).T
+    in_range = (np.isfinite(numbers) & (numbers >= low) & (numbers <= high)).all(axis=1)
+    valid[valid] = in_range
+    values[valid] = numbers[in_range]
+    return values, valid
+
+
+@functools.lru_cache(maxsize=None)
+def _fraction_digits(decimals):
+    # ".ddd" of every fraction with trailing zeros (and a bare point) dropped,
+    # NUL-padded to a fixed width
+    text = "".join(
+        f".{i:0{decimals}d}".rstrip("0").rstrip(".").ljust(decimals + 1, "\0")
+        for i in range(10**decimals)
+    )
+    return np.frombuffer(text.encode("ascii"), dtype=np.uint8).reshape(
+        10**decimals, decimals + 1
+    )
+
+
+def _number_column(values, decimals):
+    # Text of one component rounded to the given decimals, as a byte matrix
+    # read from digit tables: the whole part four digits at a time, right-
+    # aligned, then the fraction. Unused cells are NUL so the caller can
+    # squeeze them out in one mask.
+    scale = 10**decimals
+    scaled = np.rint(np.abs(values) * scale).astype(np.int64)
+    whole, fraction = np.divmod(scaled, scale)
+    limbs = -(-len(str(int(whole.max()))) // 4)
+    width = 4 * limbs
+    out = np.zeros((len(values), 1 + width + decimals + 1), dtype=np.uint8)
+    for limb in range(limbs):
+        group = whole // 10 ** (4 * (limbs - 1 - limb)) % 10000
+        out[:, 1 + 4 * limb : 5 + 4 * limb] = _PADDED_DIGITS[group]
+    # Leading zeros go, except the units digit
+    digit_counts = np.searchsorted(10 ** np.arange(1, width), whole, side="right")
+    leading = width - 1 - digit_counts
+    out[:, 1 : 1 + width][np.arange(width) < leading[:, None]] = 0
+    negative = np.flatnonzero((values < 0) & (scaled > 0))
+    out[negative, leading[negative]] = ord("-")
+    if decimals:
+        out[:, 1 + width :] = _fraction_digits(decimals)[fraction]
+    return out
+
+
+def _format_numbers(values, pieces, decimals):
+    # pieces are the literal text around the components, e.g. "hsl(", ", ",
+    # "%, ", "%)"; everything is assembled as one byte matrix
+    count = len(values)
+    if not count:
+        return []
+    columns = []
+    for index, piece in enumerate(pieces):
+        literal = np.frombuffer(piece.encode("ascii"), dtype=np.uint8)
+        columns.append(np.broadcast_to(literal, (count, len(literal))))
+        if index < len(decimals):
+            columns.append(_number_column(values[:, index], decimals[index]))
+    columns.append(np.full((count, 1), ord("\n"), dtype=np.uint8))
+    out = np.hstack(columns)
+    return out[out != 0].tobytes().decode("ascii").split("\n")[:-1]
+
+
+def _rgb_bytes(values):
+    return np.rint(np.clip(values, 0, 255)).astype(np.uint8)
+
+
+def _hue(rgb, high, chroma):
+    r, g, b = rgb.T
+    safe = np.where(chroma > 0, chroma, 1)
+    hue = np.where(
+        high == r,
+        ((g - b) / safe) % 6,
+        np.where(high == g, (b - r) / safe + 2, (r - g) / safe + 4),
+    )
+    return np.where(chroma > 0, hue * 60, 0.0)
+
+
+def _rgb_to_hsl(rgb):
+    rgb = rgb / 255
+    high = rgb.max(axis=1)
+    low = rgb.min(axis=1)
+    chroma = high - low
+    lightness = (high + low) / 2
+    denominator = 1 - np.abs(2 * lightness - 1)
+    saturation = np.divide(
+        chroma, denominator, out=np.zeros_like(chroma), where=denominator > 0
+    )
+    return np.column_stack([_hue(rgb, high, chroma), saturation * 100, lightness * 100])
+
+
+def _hsl_to_rgb(hsl):
+    hue = hsl[:, 0:1] % 360
+    saturation = hsl[:, 1:2] / 100
+    lightness = hsl[:, 2:3] / 100
+    a = saturation * np.minimum(lightness, 1 - lightness)
+    k = (np.array([0, 8, 4]) + hue / 30) % 12
+    return 255 * (lightness - a * np.clip(np.minimum(k - 3, 9 - k), -1, 1))
+
+
+def _rgb_to_hsv(rgb):
+    rgb = rgb / 255
+    high = rgb.max(axis=1)
+    chroma = high - rgb.min(axis=1)
+    saturation = np.divide(chroma, high, out=np.zeros_like(chroma), where=high > 0)
+    return np.column_stack([_hue(rgb, high, chroma), saturation * 100, high * 100])
+
+
+def _hsv_to_rgb(hsv):
+    hue = hsv[:, 0:1] % 360
+    saturation = hsv[:, 1:2] / 100
+    value = hsv[:, 2:3] / 100
+    k = (np.array([5, 3, 1]) + hue / 60) % 6
+    return 255 * (value - value * saturation * np.clip(np.minimum(k, 4 - k), 0, 1))
+
+
+def _rgb_to_cmyk(rgb):
+    rgb = rgb / 255
+    black = 1 - rgb.max(axis=1, keepdims=True)
+    cmy = np.divide(1 - rgb - black, 1 - black, out=np.zeros_like(rgb), where=black < 1)
+    return np.hstack([cmy, black]) * 100
+
+
+def _cmyk_to_rgb(cmyk):
+    return 255 * (1 - cmyk[:, :3] / 100) * (1 - cmyk[:, 3:] / 100)
+
+
+def _rgb_to_linear(rgb):
+    rgb = rgb / 255
+    return np.where(rgb <= 0.04045, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+
+
+def _linear_to_rgb(linear):
+    # Colors outside the sRGB gamut are clipped on the way into RGB
+    linear = np.clip(linear, 0, 1)
+    return 255 * np.where(
+        linear <= 0.0031308, 12.92 * linear, 1.055 * linear ** (1 / 2.4) - 0.055
+    )
+
+
+# Linear sRGB to CIE XYZ (D65, Y of white = 100)
+_LINEAR_TO_XYZ = 100 * np.array(
+    [
+        [0.4124564, 0.3575761, 0.1804375],
+        [0.2126729, 0.7151522, 0.0721750],
+        [0.0193339, 0.1191920, 0.9503041],
+    ]
+)
+# Reference white for Lab: sRGB white in XYZ, so white is exactly L=100
+_WHITE = _LINEAR_TO_XYZ.sum(axis=1)
+_LAB_DELTA = 6 / 29
+
+# OKLab: linear sRGB to cone responses, and cube-rooted cones to OKLab
+_LINEAR_TO_LMS = np.array(
+    [
+        [0.4122214708, 0.5363325363, 0.0514459929],
+        [0.2119034982, 0.6806995451, 0.1073969566],
+        [0.0883024619, 0.2817188376, 0.6299787005],
+    ]
+)
+_CBRT_LMS_TO_OKLAB = np.array(
+    [
+        [0.2104542553, 0.7936177850, -0.0040720468],
+        [1.9779984951, -2.4285922050, 0.4505937099],
+        [0.0259040371, 0.7827717662, -0.8086757660],
+    ]
+)
+
+
+def _xyz_to_lab(xyz):
+    t = xyz / _WHITE
+    f = np.where(t > _LAB_DELTA**3, np.cbrt(t), t / (3 * _LAB_DELTA**2) + 4 / 29)
+    return np.column_stack(
+        [116 * f[:, 1] - 16, 500 * (f[:, 0] - f[:, 1]), 200 * (f[:, 1] - f[:, 2])]
+    )
+
+
+def _lab_to_xyz(lab):
+    fy = (lab[:, 0] + 16) / 116
+    f = np.column_stack([fy + lab[:, 1] / 500, fy, fy - lab[:, 2] / 200])
+    return _WHITE * np.where(f > _LAB_DELTA, f**3, 3 * _LAB_DELTA**2 * (f - 4 / 29))
+
+
+def _cube(values):
+    return values**3
+
+
+# Conversion graph between internal value spaces. An edge is a function on
+# (n, k) arrays or a matrix; runs of matrices on a path are multiplied into
+# one when the paths are precomputed below.
+_EDGES = {
+    ("rgb", "hsl"): _rgb_to_hsl,
+    ("hsl", "rgb"): _hsl_to_rgb,
+    ("rgb", "hsv"): _rgb_to_hsv,
+    ("hsv", "rgb"): _hsv_to_rgb,
+    ("rgb", "cmyk"): _rgb_to_cmyk,
+    ("cmyk", "rgb"): _cmyk_to_rgb,
+    ("rgb", "linear"): _rgb_to_linear,
+    ("linear", "rgb"): _linear_to_rgb,
+    ("linear", "xyz"): _LINEAR_TO_XYZ,
+    ("xyz", "linear"): np.linalg.inv(_LINEAR_TO_XYZ),
+    ("xyz", "lab"): _xyz_to_lab,
+    ("lab", "xyz"): _lab_to_xyz,
+    ("linear", "lms"): _LINEAR_TO_LMS,
+    ("lms", "linear"): np.linalg.inv(_LINEAR_TO_LMS),
+    ("lms", "cbrt_lms"): np.cbrt,
+    ("cbrt_lms", "lms"): _cube,
+    ("cbrt_lms", "oklab"): _CBRT_LMS_TO_OKLAB,
+    ("oklab", "cbrt_lms"): np.linalg.inv(_CBRT_LMS_TO_OKLAB),
+}
+
+
+def _shortest_paths(source):
+    # Breadth-first search; returns the node path to every reachable node
+    paths = {source: [source]}
+    queue = collections.deque([source])
+    while queue:
+        node = queue.popleft()
+        for start, end in _EDGES:
+            if start == node and end not in paths:
+                paths[end] = paths[node] + [end]
+                queue.append(end)
+    return paths
+
+
+def _path_steps(nodes):
+    steps = []
+    for start, end in zip(nodes, nodes[1:]):
+        edge = _EDGES[(start, end)]
+        if isinstance(edge, np.ndarray) and steps and isinstance(steps[-1], np.ndarray):
+            steps[-1] = edge @ steps[-1]
+        else:
+            steps.append(edge)
+    return steps
+
+
+_PATHS = {
+    (source, target): _path_steps(nodes)
+    for source in {start for start, _ in _EDGES}
+    for target, nodes in _shortest_paths(source).items()
+}
+
+
+def _number_space(node, name, label, pieces, decimals, ranges):
+    return (
+        node,
+        functools.partial(_parse_number_colors, name=name, label=label, ranges=ranges),
+        functools.partial(_number_values, name=name, label=label, ranges=ranges),
+        functools.partial(_format_numbers, pieces=pieces, decimals=decimals),
+    )
+
+
+_ANY = (-np.inf, np.inf)
+_PERCENT = (0, 100)
+
+# Text notations: internal node, batch parser, per-line parser (the source
+# of error messages for lines the batch parser rejected) and batch formatter
+COLOR_SPACES = {
+    "HEX": (
+        "rgb",
+        _parse_hex_colors,
+        _hex_values,
+        lambda values: _format_hex_colors(_rgb_bytes(values)),
+    ),
+    "RGB": (
+        "rgb",
+        _parse_rgb_colors,
+        _rgb_values,
+        lambda values: _format_rgb_colors(_rgb_bytes(values)),
+    ),
+    "HSL": _number_space(
+        "hsl",
+        "hsl",
+        "HSL",
+        ("hsl(", ", ", "%, ", "%)"),
+        (1, 1, 1),
+        (_ANY, _PERCENT, _PERCENT),
+    ),
+    "HSV": _number_space(
+        "hsv",
+        "hsv",
+        "HSV",
+        ("hsv(", ", ", "%, ", "%)"),
+        (1, 1, 1),
+        (_ANY, _PERCENT, _PERCENT),
+    ),
+    "CMYK": _number_space(
+        "cmyk",
+        "cmyk",
+        "CMYK",
+        ("cmyk(", "%, ", "%, ", "%, ", "%)"),
+        (1, 1, 1, 1),
+        (_PERCENT,) * 4,
+    ),
+    "XYZ": _number_space(
+        "xyz", "xyz", "XYZ", ("xyz(", ", ", ", ", ")"), (3, 3, 3), (_ANY,) * 3
+    ),
+    "Lab": _number_space(
+        "lab", "lab", "Lab", ("lab(", ", ", ", ", ")"), (2, 2, 2), (_ANY,) * 3
+    ),
+    "OKLab": _number_space(
+        "oklab",
+        "oklab",
+        "OKLab",
+        ("oklab(", ", ", ", ", ")"),
+        (5, 5, 5),
+        (_ANY,) * 3,
+    ),
+}
+
+# Results past this size cannot be formatted and are reported as errors
+_MAX_MAGNITUDE = 1e15
+
+
+def convert_colors(values, from_space, to_space):
+    # Batched conversion of an (n, k) float array along the precomputed path
+    for step in _PATHS[(COLOR_SPACES[from_space][0], COLOR_SPACES[to_space][0])]:
+        if isinstance(step, np.ndarray):
+            values = values @ step.T
+        else:
+            values = step(values)
+    return values
+
+
+def convert_color_lines(lines, from_space, to_space, first_line=1):
+    # Convert one color per line. Returns the converted lines and (line
+    # number, message) pairs; a line that fails is passed through unchanged.
+    _, parse, parse_one, format_colors = COLOR_SPACES[from_space]
+    values, valid = parse(lines)
+    values = values.astype(np.float64)
+    errors = []
+    for index in np.flatnonzero(~valid).tolist():
+        try:
+            values[index] = parse_one(lines[index])
+            valid[index] = True
+        except ValueError as e:
+            errors.append((first_line + index, str(e)))
+    with np.errstate(all="ignore"):
+        results = convert_colors(values[valid], from_space, to_space)
+    in_range = (np.abs(results) < _MAX_MAGNITUDE).all(axis=1)
+    if not in_range.all():
+        rejected = np.flatnonzero(valid)[~in_range]
+        errors.extend(
+            (first_line + index, "Result is out of range.")
+            for index in rejected.tolist()
+        )
+        errors.sort()
+        valid[rejected] = False
+        results = results[in_range]
+    formatted = COLOR_SPACES[to_space][3](results)
+    if valid.all():
+        return formatted, errors
+    converted = list(lines)
+    for index, result in zip(np.flatnonzero(valid).tolist(), formatted):
+        converted[index] = result
+    return converted, errors
+
+
+def convert_color(text, from_space, to_space):
+    # Single colors go through the batch code as a batch of one
+    converted, errors = convert_color_lines([text], from_space, to_space)
+    if errors:
+        raise ValueError(errors[0][1])
+    return converted[0]
+
+
+def convert_color_file(input_path, output_path, from_space, to_space):
+    # One color per line. Returns (count, error count, reported errors).
+    if from_space not in COLOR_SPACES or to_space not in COLOR_SPACES:
+        raise ValueError(f"Unsupported conversion: {from_space} to {to_space}")
+    return convert_lines_file(
+        input_path,
+        output_path,
+        lambda lines, first_line: convert_color_lines(
+            lines, from_space, to_space, first_line
+        ),
+    )
+
+
+def _median_cut(points, count):
+    # Split the box with the most spread (range times pixel count) along its
+    # widest channel until there are count boxes; returns the box means. The
+    # cut is the change of value closest to the median, so a large area of
+    # one color is never split in two.
+    boxes = [points]
+    while len(boxes) < count:
+        spreads = [np.ptp(box, axis=0) for box in boxes]
+        scores = [spread.max() * len(box) for spread, box in zip(spreads, boxes)]
+        index = int(np.argmax(scores))
+        if scores[index] <= 0:
+            break
+        channel = spreads[index].argmax()
+        box = boxes.pop(index)
+        box = box[np.argsort(box[:, channel], kind="stable")]
+        cuts = np.flatnonzero(np.diff(box[:, channel])) + 1
+        cut = cuts[np.abs(cuts - len(box) // 2).argmin()]
+        boxes += [box[:cut], box[cut:]]
+    return np.array([box.mean(axis=0) for box in boxes])
+
+
+def _nearest_centers(points, centers):
+    # Index of the closest center for every point, from |p|^2 - 2p.c + |c|^2
+    distances = (centers**2).sum(axis=1) - 2 * points @ centers.T
+    return distances.argmin(axis=1)
+
+
+def extract_palette(pixels, count=PALETTE_SIZE, iterations=KMEANS_ITERATIONS):
+    # Dominant colors of an (n, 3) uint8 RGB array: an even sample of at most
+    # PALETTE_PIXELS pixels, clustered in OKLab so distances follow perceived
+    # color differences. Median cut seeds the centers and k-means refines
+    # them for a fixed number of rounds. Returns (k, 3) uint8 colors and
+    # their shares of the image, most common first.
+    if not len(pixels):
+        raise ValueError("The image has no opaque pixels.")
+    if len(pixels) > PALETTE_PIXELS:
+        pixels = pixels[
+            np.linspace(0, len(pixels) - 1, PALETTE_PIXELS).astype(np.int64)
+        ]
+    points = convert_colors(pixels.astype(np.float64), "RGB", "OKLab")
+    centers = _median_cut(points, count)
+    for _ in range(iterations):
+        labels = _nearest_centers(points, centers)
+        counts = np.bincount(labels, minlength=len(centers))
+        sums = np.column_stack(
+            [
+                np.bincount(labels, weights=points[:, channel], minlength=len(centers))
+                for channel in range(3)
+            ]
+        )
+        used = counts > 0
+        updated = sums[used] / counts[used, None]
+        if np.allclose(updated, centers[used]):
+            break
+        centers[used] = updated
+    counts = np.bincount(_nearest_centers(points, centers), minlength=len(centers))
+    order = np.argsort(-counts, kind="stable")
+    order = order[counts[order] > 0]
+    colors = _rgb_bytes(convert_colors(centers[order], "OKLab", "RGB"))
+    return colors, counts[order] / counts.sum()
+
+
+def format_palette(colors, space="HEX"):
+    # Palette colors in one of the text notations, one per line
+    values = convert_colors(colors.astype(np.float64), "RGB", space)
+    return COLOR_SPACES[space][3](values)
@@ -1,4 +1,9 @@
+import os
 import sys
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
 from PyQt5.QtWidgets import (
     QApplication,
     QMainWindow,
@@ -12,49 +17,86 @@ from PyQt5.QtWidgets import (
     QFileDialog,
     QColorDialog,
     QComboBox,
+    QCheckBox,
+    QLabel,
+    QPlainTextEdit,
+    QSpinBox,
 )
-from PyQt5.QtGui import QColor, QFont, QClipboard
-from PyQt5.QtCore import Qt
-
-
-def hex_to_rgb(hex_str):
-    hex_str = hex_str.strip().lstrip("#")
-    if len(hex_str) != 6:
-        raise ValueError("HEX color must be 6 characters long.")
-    try:
-        r = int(hex_str[0:2], 16)
-        g = int(hex_str[2:4], 16)
-        b = int(hex_str[4:6], 16)
-    except Exception as e:
-        raise ValueError("Invalid HEX color code.") from e
-    return f"rgb({r}, {g}, {b})"
-
-
-def rgb_to_hex(rgb_str):
-    # Expecting input as "r, g, b" or "r g b"
-    parts = (
-        rgb_str.replace("(", "")
-        .replace(")", "")
-        .replace("rgb", "")
-        .replace(",", " ")
-        .split()
+from PyQt5.QtGui import QColor, QFont, QClipboard, QImage, QImageReader
+from PyQt5.QtCore import Qt, QBuffer, QIODevice, QSize
+
+if not __package__:
+    # Run directly as a script (python apps/<tool>.py): make the `apps`
+    # package importable from the project directory
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from apps.color_codec import (
+    COLOR_SPACES,
+    PALETTE_PIXELS,
+    PALETTE_SIZE,
+    convert_color,
+    convert_color_file,
+    convert_color_lines,
+    extract_palette,
+    format_palette,
+)
+from apps.batch_report import report_batch
+from apps.workers import run_in_background
+
+# Palettes by (SHA-256 of the image file, color count), most recent last
+PALETTE_CACHE_SIZE = 32
+_palette_cache = OrderedDict()
+
+
+def load_image_pixels(data, max_pixels=PALETTE_PIXELS):
+    # Decode straight to a size of at most max_pixels; JPEG and friends skip
+    # most of the full-size decode. Returns the opaque pixels as an (n, 3)
+    # uint8 RGB array.
+    buffer = QBuffer()
+    buffer.setData(data)
+    buffer.open(QIODevice.ReadOnly)
+    reader = QImageReader(buffer)
+    reader.setAutoTransform(True)
+    size = reader.size()
+    if size.isValid() and size.width() * size.height() > max_pixels:
+        scale = (max_pixels / (size.width() * size.height())) ** 0.5
+        reader.setScaledSize(
+            QSize(max(1, int(size.width() * scale)), max(1, int(size.height() * scale)))
+        )
+    image = reader.read()
+    if image.isNull():
+        raise ValueError(reader.errorString())
+    image = image.convertToFormat(QImage.Format_RGBA8888)
+    bits = image.constBits()
+    bits.setsize(image.sizeInBytes())
+    rows = np.frombuffer(bits, dtype=np.uint8).reshape(
+        image.height(), image.bytesPerLine()
     )
-    if len(parts) != 3:
-        raise ValueError("RGB input must have three components.")
-    try:
-        r, g, b = [int(part) for part in parts]
-        if not all(0 <= x <= 255 for x in [r, g, b]):
-            raise ValueError("RGB values must be in the range 0-255.")
-    except Exception as e:
-        raise ValueError("Invalid RGB input.") from e
-    return f"#{r:02X}{g:02X}{b:02X}"
+    rgba = rows[:, : 4 * image.width()].reshape(-1, 4)
+    return rgba[rgba[:, 3] >= 128, :3]
+
+
+def image_palette(image_path, count=PALETTE_SIZE):
+    # Cached by content hash, so the same screenshot under another name, or
+    # opened again, is not decoded twice
+    with open(image_path, "rb") as image_file:
+        data = image_file.read()
+    key = (hashlib.sha256(data).hexdigest(), count)
+    if key in _palette_cache:
+        _palette_cache.move_to_end(key)
+        return _palette_cache[key]
+    palette = extract_palette(load_image_pixels(data), count)
+    _palette_cache[key] = palette
+    if len(_palette_cache) > PALETTE_CACHE_SIZE:
+        _palette_cache.popitem(last=False)
+    return palette
 
 
 class colorPickerConverterApp(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Color Picker and Converter")
-        self.resize(600, 550)
+        self.resize(600, 750)
 
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
@@ -92,23 +134,83 @@ class colorPickerConverterApp(QMainWindow):
         self.pickColorButton.clicked.connect(self.pick_color)
         main_layout.addWidget(self.pickColorButton)
 
+        # Palette extraction from an image
+        palette_layout = QHBoxLayout()
+        palette_layout.setSpacing(10)
+        self.paletteButton = QPushButton("Extract Palette from Image...")
+        self.paletteButton.setStyleSheet(
+            """
+            QPushButton {
+                background-color: #009688;
+                color: white;
+                padding: 10px;
+                border: none;
+                border-radius: 4px;
+                font-size: 14px;
+            }
+            QPushButton:hover {
+                background-color: #00796B;
+            }
+            """
+        )
+        self.paletteButton.clicked.connect(self.extract_image_palette)
+        palette_layout.addWidget(self.paletteButton, 1)
+        palette_layout.addWidget(QLabel("Colors:"))
+        self.paletteSizeSpinBox = QSpinBox()
+        self.paletteSizeSpinBox.setRange(2, 16)
+        self.paletteSizeSpinBox.setValue(PALETTE_SIZE)
+        self.paletteSizeSpinBox.setStyleSheet(
+            "padding: 6px; border: 1px solid #ccc; border-radius: 4px; font-size: 14px;"
+        )
+        palette_layout.addWidget(self.paletteSizeSpinBox)
+        main_layout.addLayout(palette_layout)
+
+        # Swatches of the extracted palette
+        self.swatchLayout = QHBoxLayout()
+        self.swatchLayout.setSpacing(4)
+        main_layout.addLayout(self.swatchLayout)
+
         # Input field for color code
         self.inputField = QLineEdit()
         self.inputField.setPlaceholderText(
-            "Enter HEX (e.g. #FF5733) or RGB (e.g. 255,87,51)"
+            "Enter a color, e.g. #FF5733, 255,87,51 or hsl(11, 100%, 60%)"
         )
         self.inputField.setStyleSheet(
             "padding: 8px; border: 1px solid #ccc; border-radius: 4px; font-size: 14px;"
         )
         main_layout.addWidget(self.inputField)
 
-        # ComboBox for selecting conversion direction
-        self.conversionComboBox = QComboBox()
-        self.conversionComboBox.setStyleSheet(
-            "padding: 6px; border: 1px solid #ccc; border-radius: 4px; font-size: 14px;"
+        # Batch input: one color per line, shown instead of the single field
+        self.listInputField = QPlainTextEdit()
+        self.listInputField.setPlaceholderText("Paste colors, one per line...")
+        self.listInputField.setStyleSheet(
+            "padding: 8px; border: 1px solid #ccc; border-radius: 4px; font-size: 14px;"
         )
-        self.conversionComboBox.addItems(["HEX to RGB", "RGB to HEX"])
-        main_layout.addWidget(self.conversionComboBox)
+        self.listInputField.setVisible(False)
+        main_layout.addWidget(self.listInputField)
+
+        self.batchCheckBox = QCheckBox("Batch: one color per line")
+        self.batchCheckBox.setStyleSheet("font-size: 14px;")
+        self.batchCheckBox.toggled.connect(self.toggle_batch_mode)
+        main_layout.addWidget(self.batchCheckBox)
+
+        # ComboBoxes for selecting the source and target color spaces
+        space_layout = QHBoxLayout()
+        space_layout.setSpacing(10)
+        self.fromComboBox = QComboBox()
+        self.toComboBox = QComboBox()
+        for label, combo_box in (
+            ("From:", self.fromComboBox),
+            ("To:", self.toComboBox),
+        ):
+            combo_box.setStyleSheet(
+                "padding: 6px; border: 1px solid #ccc; border-radius: 4px; font-size: 14px;"
+            )
+            combo_box.addItems(list(COLOR_SPACES))
+            space_layout.addWidget(QLabel(label))
+            space_layout.addWidget(combo_box, 1)
+        self.toComboBox.setCurrentText("RGB")
+        main_layout.addLayout(space_layout)
 
         # Convert button
         self.convertButton = QPushButton("Convert")
@@ -183,6 +285,31 @@ class colorPickerConverterApp(QMainWindow):
 
         main_layout.addLayout(btn_layout)
 
+        # Batch conversion of a file with one color per line
+        self.convertFileButton = QPushButton("Convert File...")
+        self.convertFileButton.setStyleSheet(
+            """
+            QPushButton {
+                background-color: #607D8B;
+                color: white;
+                padding: 8px;
+                border: none;
+                border-radius: 4px;
+                font-size: 14px;
+            }
+            QPushButton:hover {
+                background-color: #455A64;
+            }
+            """
+        )
+        self.convertFileButton.clicked.connect(self.convert_file)
+        main_layout.addWidget(self.convertFileButton)
+
+        self.batchStatusLabel = QLabel("")
+        self.batchStatusLabel.setWordWrap(True)
+        self.batchStatusLabel.setStyleSheet("font-size: 13px; color: #555;")
+        main_layout.addWidget(self.batchStatusLabel)
+
         self.setFont(QFont("Arial", 10))
 
     def pick_color(self):
@@ -190,30 +317,154 @@ class colorPickerConverterApp(QMainWindow):
         if color.isValid():
             # Display the selected color's HEX in the inputField
             self.inputField.setText(color.name().upper())
-            # Also show the RGB value in the output field
+            self.fromComboBox.setCurrentText("HEX")
+            # Also show it in the selected target space in the output field
             self.outputField.setPlainText(
-                f"rgb({color.red()}, {color.green()}, {color.blue()})"
+                convert_color(color.name(), "HEX", self.toComboBox.currentText())
             )
 
+    def extract_image_palette(self):
+        image_path, _ = QFileDialog.getOpenFileName(
+            self,
+            "Select Image",
+            "",
+            "Images (*.png *.jpg *.jpeg *.bmp *.gif *.webp);;All Files (*)",
+        )
+        if not image_path:
+            return
+        self.paletteButton.setEnabled(False)
+        self.batchStatusLabel.setText(f"Extracting palette from {image_path}...")
+        self.paletteWorker = run_in_background(
+            image_palette,
+            image_path,
+            self.paletteSizeSpinBox.value(),
+            on_finished=self.palette_extracted,
+            on_failed=self.palette_failed,
+        )
+
+    def palette_extracted(self, palette):
+        colors, shares = palette
+        self.paletteButton.setEnabled(True)
+        while self.swatchLayout.count():
+            self.swatchLayout.takeAt(0).widget().deleteLater()
+        hex_colors = format_palette(colors)
+        for hex_color, share in zip(hex_colors, shares):
+            swatch = QLabel()
+            swatch.setMinimumHeight(32)
+            swatch.setToolTip(f"{hex_color} ({share:.1%})")
+            swatch.setStyleSheet(
+                f"background-color: {hex_color}; border: 1px solid #ccc; border-radius: 4px;"
+            )
+            self.swatchLayout.addWidget(swatch, max(1, round(100 * share)))
+        self.outputField.setPlainText(
+            "\n".join(format_palette(colors, self.toComboBox.currentText()))
+        )
+        self.batchStatusLabel.setText(
+            f"Extracted {len(colors)} colors: "
+            + ", ".join(
+                f"{hex_color} {share:.0%}"
+                for hex_color, share in zip(hex_colors, shares)
+            )
+        )
+
+    def palette_failed(self, error):
+        self.paletteButton.setEnabled(True)
+        self.batchStatusLabel.setText("Palette extraction failed.")
+        QMessageBox.critical(
+            self, "Palette Extraction", f"Failed to extract a palette:\n{error}"
+        )
+
+    def toggle_batch_mode(self, enabled):
+        self.inputField.setVisible(not enabled)
+        self.listInputField.setVisible(enabled)
+
     def perform_conversion(self):
+        if self.batchCheckBox.isChecked():
+            self.convert_list()
+            return
         text = self.inputField.text().strip()
         if not text:
             QMessageBox.warning(
                 self, "Input Error", "Please enter a color value or pick one."
             )
             return
-        conversion = self.conversionComboBox.currentText()
         try:
-            if conversion == "HEX to RGB":
-                result = hex_to_rgb(text)
-            elif conversion == "RGB to HEX":
-                result = rgb_to_hex(text)
-            else:
-                result = "Unknown conversion operation."
+            result = convert_color(
+                text, self.fromComboBox.currentText(), self.toComboBox.currentText()
+            )
             self.outputField.setPlainText(result)
         except Exception as e:
             QMessageBox.critical(self, "Conversion Error", f"Error: {str(e)}")
 
+    def convert_list(self):
+        lines = self.listInputField.toPlainText().splitlines()
+        if not any(line.strip() for line in lines):
+            QMessageBox.warning(self, "Input Error", "Please enter colors to convert.")
+            return
+        self.convertButton.setEnabled(False)
+        self.outputField.setPlainText("Converting...")
+        self.conversionWorker = run_in_background(
+            convert_color_lines,
+            lines,
+            self.fromComboBox.currentText(),
+            self.toComboBox.currentText(),
+            on_finished=self.list_converted,
+            on_failed=self.list_failed,
+        )
+
+    def list_converted(self, result):
+        converted, errors = result
+        self.convertButton.setEnabled(True)
+        self.outputField.setPlainText("\n".join(converted))
+        self.report_errors(len(converted), len(errors), errors)
+
+    def list_failed(self, error):
+        self.convertButton.setEnabled(True)
+        self.outputField.clear()
+        QMessageBox.critical(
+            self, "Conversion Error", f"Failed to convert colors:\n{error}"
+        )
+
+    def report_errors(self, total, error_count, errors):
+        report_batch(self, self.batchStatusLabel, "colors", total, error_count, errors)
+
+    def convert_file(self):
+        file_filter = "Text Files (*.txt);;All Files (*)"
+        input_path, _ = QFileDialog.getOpenFileName(
+            self, "Select Colors File", "", file_filter
+        )
+        if not input_path:
+            return
+        output_path, _ = QFileDialog.getSaveFileName(
+            self, "Save Converted Colors", "", file_filter
+        )
+        if not output_path:
+            return
+        self.convertFileButton.setEnabled(False)
+        self.batchStatusLabel.setText(f"Converting {input_path}...")
+        self.fileWorker = run_in_background(
+            convert_color_file,
+            input_path,
+            output_path,
+            self.fromComboBox.currentText(),
+            self.toComboBox.currentText(),
+            on_finished=self.file_converted,
+            on_failed=self.file_failed,
+        )
+
+    def file_converted(self, result):
+        self.convertFileButton.setEnabled(True)
+        self.report_errors(*result)
+
+    def file_failed(self, error):
+        self.convertFileButton.setEnabled(True)
+        self.batchStatusLabel.setText("Batch conversion failed.")
+        QMessageBox.critical(
+            self,
+            "Batch Conversion",
+            f"An error occurred during batch conversion:\n{error}",
+        )
+
     def copy_result(self):
         result_text = self.outputField.toPlainText()
         if not result_text:
@@ -1,8 +1,5 @@
 import sys
 import os
-import json
-import csv
-import yaml
 import traceback
 from PyQt5.QtWidgets import (
     QApplication,
@@ -17,76 +14,28 @@ from PyQt5.QtWidgets import (
     QMessageBox,
     QFileDialog,
     QTextEdit,
+    QCheckBox,
 )
 from PyQt5.QtCore import Qt
 
-
-def json_to_csv(json_file, csv_file):
-    with open(json_file, "r") as jf:
-        data = json.load(jf)
-    if not isinstance(data, list):
-        raise ValueError("JSON data must be a list of objects")
-    if len(data) == 0:
-        raise ValueError("JSON file is empty")
-
-    with open(csv_file, "w", newline="") as cf:
-        writer = csv.DictWriter(cf, fieldnames=data[0].keys())
-        writer.writeheader()
-        for item in data:
-            writer.writerow(item)
-
-
-def csv_to_json(csv_file, json_file):
-    with open(csv_file, "r") as cf:
-        reader = csv.DictReader(cf)
-        data = [row for row in reader]
-    with open(json_file, "w") as jf:
-        json.dump(data, jf, indent=4)
-
-
-def yaml_to_json(yaml_file, json_file):
-    with open(yaml_file, "r") as yf:
-        data = yaml.safe_load(yf)
-    with open(json_file, "w") as jf:
-        json.dump(data, jf, indent=4)
-
-
-def json_to_yaml(json_file, yaml_file):
-    with open(json_file, "r") as jf:
-        data = json.load(jf)
-    with open(yaml_file, "w") as yf:
-        yaml.dump(data, yf, default_flow_style=False)
-
-
-def csv_to_yaml(csv_file, yaml_file):
-    with open(csv_file, "r") as cf:
-        reader = csv.DictReader(cf)
-        data = [row for row in reader]
-    with open(yaml_file, "w") as yf:
-        yaml.dump(data, yf, default_flow_style=False)
-
-
-def yaml_to_csv(yaml_file, csv_file):
-    with open(yaml_file, "r") as yf:
-        data = yaml.safe_load(yf)
-    with open(csv_file, "w", newline="") as cf:
-        if isinstance(data, list) and len(data) > 0:
-            writer = csv.DictWriter(cf, fieldnames=data[0].keys())
-            writer.writeheader()
-            for row in data:
-                writer.writerow(row)
-        elif isinstance(data, dict):
-            writer = csv.writer(cf)
-            writer.writerow(list(data.keys()))
-            writer.writerow(list(data.values()))
-        else:
-            raise ValueError("YAML format not recognized for CSV conversion")
+if not __package__:
+    # Run directly as a script (python apps/<tool>.py): make the `apps`
+    # package importable from the project directory
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from apps.formats import (
+    FRAGMENT_WRITERS,
+    READERS,
+    WRITERS,
+    convert_csv_parallel,
+    convert_file,
+)
 
 
 class fileConverterApp(QMainWindow):
     def __init__(self):
         super().__init__()
-        self.setWindowTitle("JSON, CSV, and YAML Interconverter")
+        self.setWindowTitle("JSON, CSV, YAML, Parquet and Arrow Interconverter")
         self.setGeometry(100, 100, 800, 600)
 
         self.central_widget = QWidget()
@@ -136,16 +85,12 @@ class fileConverterApp(QMainWindow):
 
         # Conversion type selection
         self.formatComboBox = QComboBox()
-        self.formatComboBox.addItems(
-            [
-                "JSON to CSV",
-                "CSV to JSON",
-                "YAML to JSON",
-                "JSON to YAML",
-                "CSV to YAML",
-                "YAML to CSV",
-            ]
-        )
+        for source in READERS:
+            for target in WRITERS:
+                if source != target:
+                    self.formatComboBox.addItem(
+                        f"{source} to {target}", (source, target)
+                    )
         self.layout.addWidget(self.formatComboBox)
 
         # Input file layout: Line edit + Browse button
@@ -174,6 +119,12 @@ class fileConverterApp(QMainWindow):
         output_layout.addWidget(self.outputBrowseButton)
         self.layout.addLayout(output_layout)
 
+        # Parallel parsing applies to CSV inputs written as JSON or YAML
+        self.parallelCheckBox = QCheckBox(
+            "Parse large CSV files in parallel (CSV to JSON/YAML)"
+        )
+        self.layout.addWidget(self.parallelCheckBox)
+
         # Convert button
         self.convertButton = QPushButton("Convert")
         self.convertButton.clicked.connect(self.perform_conversion)
@@ -206,7 +157,6 @@ class fileConverterApp(QMainWindow):
             self.outputFileLineEdit.setText(selected_file)
 
     def perform_conversion(self):
-        conversion_type = self.formatComboBox.currentText()
         input_path = self.inputFileLineEdit.text().strip()
         output_path = self.outputFileLineEdit.text().strip()
 
@@ -215,20 +165,15 @@ class fileConverterApp(QMainWindow):
             return
 
         try:
-            if conversion_type == "JSON to CSV":
-                json_to_csv(input_path, output_path)
-            elif conversion_type == "CSV to JSON":
-                csv_to_json(input_path, output_path)
-            elif conversion_type == "YAML to JSON":
-                yaml_to_json(input_path, output_path)
-            elif conversion_type == "JSON to YAML":
-                json_to_yaml(input_path, output_path)
-            elif conversion_type == "CSV to YAML":
-                csv_to_yaml(input_path, output_path)
-            elif conversion_type == "YAML to CSV":
-                yaml_to_csv(input_path, output_path)
+            source, target = self.formatComboBox.currentData()
+            if (
+                self.parallelCheckBox.isChecked()
+                and source == "CSV"
+                and target in FRAGMENT_WRITERS
+            ):
+                convert_csv_parallel(input_path, target, output_path)
             else:
-                raise ValueError("Unsupported conversion type.")
+                convert_file(source, input_path, target, output_path)
 
             self.statusLabel.setText("Status: Conversion complete!")
         except Exception as e:
@@ -0,0 +1,514 @@
+import contextlib
+import csv
+import io
+import itertools
+import json
+import mmap
+import os
+import re
+import shutil
+import tempfile
+from collections import namedtuple
+
+import yaml
+
+from apps.parallel import ordered_map, process_pool
+
+# Use the libyaml C implementation when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as YamlLoader, CSafeDumper as YamlDumper
+except ImportError:
+    from yaml import SafeLoader as YamlLoader, SafeDumper as YamlDumper
+
+# Rows per record batch when streaming to and from Parquet/Arrow files
+BATCH_SIZE = 65536
+
+# Text input may start with a byte order mark, as spreadsheet exports often
+# do; every reader, sequential or parallel, drops it the same way
+INPUT_ENCODING = "utf-8-sig"
+
+# Bytes of CSV handed to each worker process in parallel conversions
+PARALLEL_CHUNK_SIZE = 64 << 20
+
+# Every reader turns an open file into an iterator of records (dicts) and
+# every writer consumes such an iterator, so any reader can feed any writer.
+# `binary` tells the pipeline how to open the file for the plugin.
+Plugin = namedtuple("Plugin", ["function", "binary"])
+
+READERS = {}
+WRITERS = {}
+
+# File extensions used to guess a format when none is given explicitly
+EXTENSIONS = {
+    ".json": "JSON",
+    ".jsonl": "JSON",
+    ".ndjson": "JSON",
+    ".csv": "CSV",
+    ".yaml": "YAML",
+    ".yml": "YAML",
+    ".parquet": "Parquet",
+    ".arrow": "Arrow",
+    ".feather": "Arrow",
+}
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# Characters that may follow a complete JSON number
+_NUMBER_END = frozenset(" \t\n\r,]}")
+
+
+def register_reader(name, binary=False):
+    def decorator(function):
+        READERS[name] = Plugin(function, binary)
+        return function
+
+    return decorator
+
+
+def register_writer(name, binary=False):
+    def decorator(function):
+        WRITERS[name] = Plugin(function, binary)
+        return function
+
+    return decorator
+
+
+def format_for_path(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in EXTENSIONS:
+        raise ValueError(f"Cannot tell the format of '{path}' from its extension")
+    return EXTENSIONS[extension]
+
+
+def convert(source, input_file, target, output_file):
+    WRITERS[target].function(READERS[source].function(input_file), output_file)
+
+
+def convert_file(source, input_path, target, output_path):
+    if source not in READERS:
+        raise ValueError(f"Unsupported input format: {source}")
+    if target not in WRITERS:
+        raise ValueError(f"Unsupported output format: {target}")
+    with _open(input_path, "r", READERS[source].binary) as input_file:
+        with replacing_output(output_path, WRITERS[target].binary) as output_file:
+            convert(source, input_file, target, output_file)
+
+
+def _open(path, mode, binary):
+    if binary:
+        return open(path, mode + "b")
+    encoding = INPUT_ENCODING if mode == "r" else "utf-8"
+    return open(path, mode, encoding=encoding, newline="")
+
+
+@contextlib.contextmanager
+def replacing_output(output_path, binary):
+    # Write next to the destination and only move the result into place once
+    # the conversion succeeded: a failure never leaves a partial output behind
+    # and converting a file onto itself still reads the original
+    fd, temp_path = tempfile.mkstemp(
+        prefix=".", suffix=".tmp", dir=os.path.dirname(os.path.abspath(output_path))
+    )
+    os.close(fd)
+    try:
+        if os.path.exists(output_path):
+            shutil.copymode(output_path, temp_path)
+        else:
+            # mkstemp creates private files; use the usual mode for new ones
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(temp_path, 0o666 & ~umask)
+        with _open(temp_path, "w", binary) as output_file:
+            yield output_file
+        os.replace(temp_path, output_path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+def _batched(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _require_dicts(records, target):
+    for record in records:
+        if not isinstance(record, dict):
+            raise ValueError(f"{target} output needs a list of objects")
+        yield record
+
+
+def _seekable(binary_file):
+    # Columnar readers need random access; buffer pipes such as stdin
+    if binary_file.seekable():
+        return binary_file
+    return io.BytesIO(binary_file.read())
+
+
+def _import_pyarrow():
+    # pyarrow is only needed for the columnar formats, so import it on demand
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError(
+            "Parquet and Arrow conversions require pyarrow (pip install pyarrow)."
+        ) from e
+    return pyarrow
+
+
+def _iter_json_values(jf, chunk_size=1 << 16):
+    # Incremental JSON parsing: a top-level array is yielded item by item,
+    # anything else (a single value or NDJSON) value by value.
+    decoder = json.JSONDecoder()
+    buffer, pos, eof = "", 0, False
+    in_array = None
+    need_comma = False
+    after_comma = False
+    closed = False
+
+    def refill(pos, size):
+        nonlocal buffer, eof
+        chunk = jf.read(size)
+        eof = not chunk
+        buffer = buffer[pos:] + chunk
+        return 0
+
+    while True:
+        pos = _WHITESPACE.match(buffer, pos).end()
+        if pos == len(buffer):
+            if eof:
+                break
+            pos = refill(pos, chunk_size)
+            continue
+        if in_array is None:
+            in_array = buffer[pos] == "["
+            if in_array:
+                pos += 1
+            continue
+        if closed:
+            # Only whitespace may follow the closing bracket
+            raise ValueError(
+                f"Unexpected data after JSON array: {buffer[pos:pos + 20]!r}"
+            )
+        if in_array:
+            if buffer[pos] == "]":
+                if after_comma:
+                    raise ValueError("Trailing ',' in JSON array")
+                closed = True
+                pos += 1
+                continue
+            if need_comma:
+                if buffer[pos] != ",":
+                    raise ValueError(
+                        f"Expected ',' in JSON array at: {buffer[pos:pos + 20]!r}"
+                    )
+                need_comma = False
+                after_comma = True
+                pos += 1
+                continue
+        try:
+            value, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            end = len(buffer)
+        if not eof and (
+            end == len(buffer)
+            or isinstance(value, (int, float))
+            and buffer[end] not in _NUMBER_END
+        ):
+            # The value may continue in the next chunk (a number cut after
+            # "1." still decodes as 1); grow the read so a large value is
+            # only re-decoded a logarithmic number of times
+            pos = refill(pos, max(chunk_size, len(buffer) - pos))
+            continue
+        yield value
+        pos = end
+        need_comma = in_array
+        after_comma = False
+    if in_array and not closed:
+        raise ValueError("Unexpected end of JSON input")
+
+
+def _json_item(record):
+    # JSON text never holds raw newlines inside strings, so indenting every
+    # line of the dump nests it one level into the enclosing array
+    return "    " + json.dumps(record, indent=4, default=str).replace("\n", "\n    ")
+
+
+def _json_fragment(records):
+    return ",\n".join(_json_item(record) for record in records)
+
+
+def _write_json_fragments(fragments, jf):
+    # Same layout as json.dump(list, indent=4), written one fragment at a time
+    jf.write("[")
+    empty = True
+    for fragment in fragments:
+        if fragment:
+            jf.write("\n" if empty else ",\n")
+            jf.write(fragment)
+            empty = False
+    jf.write("]" if empty else "\n]")
+
+
+@register_reader("JSON")
+def read_json(jf):
+    yield from _iter_json_values(jf)
+
+
+@register_writer("JSON")
+def write_json(records, jf):
+    _write_json_fragments(map(_json_fragment, _batched(records, 1024)), jf)
+
+
+@register_reader("CSV")
+def read_csv(cf):
+    yield from csv.DictReader(cf)
+
+
+@register_writer("CSV")
+def write_csv(records, cf):
+    records = _require_dicts(records, "CSV")
+    first = next(records, None)
+    if first is None:
+        raise ValueError("Input contains no records to write as CSV")
+    writer = csv.DictWriter(cf, fieldnames=first.keys())
+    writer.writeheader()
+    writer.writerow(first)
+    for batch in _batched(records, 1024):
+        writer.writerows(batch)
+
+
+@register_reader("YAML")
+def read_yaml(yf):
+    # Multi-document streams are loaded one document at a time
+    for document in yaml.load_all(yf, Loader=YamlLoader):
+        if isinstance(document, list):
+            yield from document
+        elif document is not None:
+            yield document
+
+
+def _yaml_fragment(records):
+    if not records:
+        return ""
+    return yaml.dump(records, Dumper=YamlDumper, default_flow_style=False)
+
+
+def _write_yaml_fragments(fragments, yf):
+    # Consecutive dumps of block-style lists concatenate into a single list
+    empty = True
+    for fragment in fragments:
+        if fragment:
+            yf.write(fragment)
+            empty = False
+    if empty:
+        yf.write("[]\n")
+
+
+@register_writer("YAML")
+def write_yaml(records, yf):
+    _write_yaml_fragments(map(_yaml_fragment, _batched(records, 1024)), yf)
+
+
+# Text formats whose output can be produced in independent fragments and
+# stitched back together, which lets CSV input be converted in parallel
+FRAGMENT_WRITERS = {
+    "JSON": (_json_fragment, _write_json_fragments),
+    "YAML": (_yaml_fragment, _write_yaml_fragments),
+}
+
+
+def _count_quotes(mm, start, end, block_size=16 << 20):
+    count = 0
+    for block_start in range(start, end, block_size):
+        count += mm[block_start : min(end, block_start + block_size)].count(b'"')
+    return count
+
+
+def csv_record_offsets(csv_file, chunk_size=PARALLEL_CHUNK_SIZE):
+    # Split a CSV file into byte ranges of roughly chunk_size that start on a
+    # record boundary. A newline only ends a record when it is preceded by an
+    # even number of quote characters, since escaped quotes ("") come in pairs.
+    # A stray quote in an unquoted field breaks this, so every range is
+    # checked again when it is parsed.
+    size = os.path.getsize(csv_file)
+    offsets = [0]
+    if size <= chunk_size:
+        return offsets + [size]
+    with open(csv_file, "rb") as cf, mmap.mmap(
+        cf.fileno(), 0, access=mmap.ACCESS_READ
+    ) as mm:
+        pos = 0
+        quotes = 0
+        for target in range(chunk_size, size, chunk_size):
+            if target <= pos:
+                continue
+            quotes += _count_quotes(mm, pos, target)
+            pos = target
+            while True:
+                newline = mm.find(b"\n", pos)
+                if newline == -1:
+                    pos = size
+                    break
+                quotes += _count_quotes(mm, pos, newline)
+                pos = newline + 1
+                if quotes % 2 == 0:
+                    break
+            if pos >= size:
+                break
+            offsets.append(pos)
+    return offsets + [size]
+
+
+class _MisalignedRange(Exception):
+    pass
+
+
+def _convert_csv_range(csv_file, start, end, fieldnames, target):
+    with open(csv_file, "rb") as cf:
+        cf.seek(start)
+        data = cf.read(end - start)
+    if start == 0:
+        # The first range still holds the header row
+        text = data.decode(INPUT_ENCODING)
+        fieldnames = None
+    else:
+        text = data.decode("utf-8")
+    try:
+        # Strict parsing fails when the range ends inside a quoted field, i.e.
+        # when the split did not land on a record boundary
+        records = list(
+            csv.DictReader(io.StringIO(text, newline=""), fieldnames, strict=True)
+        )
+    except csv.Error:
+        return None
+    return FRAGMENT_WRITERS[target][0](records)
+
+
+def _aligned(fragments):
+    for fragment in fragments:
+        if fragment is None:
+            raise _MisalignedRange
+        yield fragment
+
+
+def convert_csv_parallel(
+    input_path, target, output_path, jobs=None, chunk_size=PARALLEL_CHUNK_SIZE
+):
+    if target not in FRAGMENT_WRITERS:
+        raise ValueError(f"Parallel CSV conversion cannot write {target}")
+    with _open(input_path, "r", False) as cf:
+        fieldnames = next(csv.reader(cf), [])
+    offsets = csv_record_offsets(input_path, chunk_size)
+    ranges = list(zip(offsets, offsets[1:]))
+    write_fragments = FRAGMENT_WRITERS[target][1]
+    with replacing_output(output_path, False) as output_file:
+        try:
+            if len(ranges) == 1:
+                start, end = ranges[0]
+                fragment = _convert_csv_range(
+                    input_path, start, end, fieldnames, target
+                )
+                write_fragments(_aligned([fragment]), output_file)
+                return
+            # ordered_map keeps the fragments in file order without queueing
+            # every range at once
+            executor, jobs = process_pool(jobs)
+            with executor:
+                fragments = ordered_map(
+                    executor,
+                    _convert_csv_range,
+                    (
+                        (input_path, start, end, fieldnames, target)
+                        for start, end in ranges
+                    ),
+                    2 * jobs,
+                )
+                write_fragments(_aligned(fragments), output_file)
+                return
+        except _MisalignedRange:
+            pass
+        # A quote inside an unquoted field (12" pipe) throws off the quote
+        # parity split; start over and parse the whole file in one pass
+        output_file.seek(0)
+        output_file.truncate()
+        with _open(input_path, "r", READERS["CSV"].binary) as input_file:
+            convert("CSV", input_file, target, output_file)
+
+
+def _read_batches(batches):
+    for batch in batches:
+        yield from batch.to_pylist()
+
+
+def _write_batches(records, open_writer):
+    pa = _import_pyarrow()
+    writer = None
+    schema = None
+    try:
+        for rows in _batched(_require_dicts(records, "Columnar"), BATCH_SIZE):
+            if writer is None:
+                # The keys of the whole first batch fix the columns; later
+                # batches are cast to its schema
+                columns = dict.fromkeys(key for row in rows for key in row)
+                batch = pa.RecordBatch.from_pydict(
+                    {key: [row.get(key) for row in rows] for key in columns}
+                )
+                schema = batch.schema
+                names = set(schema.names)
+                writer = open_writer(schema)
+            else:
+                for row in rows:
+                    if not names.issuperset(row):
+                        extra = ", ".join(repr(key) for key in row if key not in names)
+                        raise ValueError(
+                            f"Record has fields not in the columns of the first"
+                            f" {BATCH_SIZE:,} records: {extra}"
+                        )
+                batch = pa.RecordBatch.from_pylist(rows, schema=schema)
+            writer.write_batch(batch)
+        if writer is None:
+            raise ValueError("Input contains no records to write")
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+@register_reader("Parquet", binary=True)
+def read_parquet(pf):
+    pa = _import_pyarrow()
+    parquet = pa.parquet.ParquetFile(_seekable(pf))
+    yield from _read_batches(parquet.iter_batches(batch_size=BATCH_SIZE))
+
+
+@register_writer("Parquet", binary=True)
+def write_parquet(records, pf):
+    pa = _import_pyarrow()
+    _write_batches(records, lambda schema: pa.parquet.ParquetWriter(pf, schema))
+
+
+@register_reader("Arrow", binary=True)
+def read_arrow(af):
+    pa = _import_pyarrow()
+    # Memory-map real files so record batches are read without copying
+    name = getattr(af, "name", None)
+    if isinstance(name, str) and os.path.isfile(name):
+        source = pa.memory_map(name, "r")
+    else:
+        source = _seekable(af)
+    reader = pa.ipc.open_file(source)
+    batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+    yield from _read_batches(batches)
+
+
+@register_writer("Arrow", binary=True)
+def write_arrow(records, af):
+    pa = _import_pyarrow()
+    # The Arrow IPC file format is what Feather v2 uses on disk
+    _write_batches(records, lambda schema: pa.ipc.new_file(af, schema))
@@ -1,6 +1,8 @@
+import os
 import sys
 import base64
-import traceback
+import mimetypes
+from functools import lru_cache
 from PyQt5.QtWidgets import (
     QApplication,
     QMainWindow,
@@ -12,15 +14,165 @@ from PyQt5.QtWidgets import (
     QTextEdit,
     QMessageBox,
     QFileDialog,
+    QLabel,
+    QComboBox,
+    QSpinBox,
 )
-from PyQt5.QtGui import QFont
-from PyQt5.QtCore import Qt
+from PyQt5.QtGui import (
+    QColor,
+    QFont,
+    QImage,
+    QImageReader,
+    QImageWriter,
+    QPainter,
+    QPixmap,
+)
+from PyQt5.QtCore import (
+    Qt,
+    QBuffer,
+    QByteArray,
+    QIODevice,
+    QMimeData,
+    QPoint,
+    QRect,
+    QSize,
+    QTimer,
+)
+
+if not __package__:
+    # Run directly as a script (python apps/<tool>.py): make the `apps`
+    # package importable from the project directory
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from apps.base64_codec import (
+    base64_length,
+    build_data_uri_bundle,
+    decode_base64_to_file,
+    encode_file_to_buffer,
+    iter_base64_chunks,
+    iter_file_chunks,
+    iter_text_chunks,
+)
+from apps.workers import run_in_background
+
+# Characters of the encoded result shown from each end in the output field;
+# laying out megabytes of text in a QTextEdit stalls the UI
+PREVIEW_CHARS = 4096
+
+
+# Bounding box for the preview of the selected image
+THUMBNAIL_SIZE = QSize(320, 180)
+
+
+@lru_cache(maxsize=64)
+def load_thumbnail(image_path, mtime_ns, max_size=THUMBNAIL_SIZE):
+    # Decode straight to preview resolution; JPEG and friends skip most of the
+    # full-size decode. mtime_ns is part of the cache key so edited files
+    # are decoded again. Returns a QImage, which is safe off the GUI thread.
+    reader = QImageReader(image_path)
+    reader.setAutoTransform(True)
+    size = reader.size()
+    if size.isValid() and (
+        size.width() > max_size.width() or size.height() > max_size.height()
+    ):
+        reader.setScaledSize(size.scaled(max_size, Qt.KeepAspectRatio))
+    image = reader.read()
+    if image.isNull():
+        raise ValueError(reader.errorString())
+    return image
+
+
+# Formats offered for re-encoding, when the Qt image plugins can write them
+RECOMPRESS_FORMATS = [("JPEG", "jpeg"), ("WebP", "webp"), ("PNG", "png")]
+
+# Side of the square region encoded to estimate the recompressed size
+SAMPLE_SIZE = 256
+
+
+def _open_scaled_reader(image_path, max_dimension):
+    reader = QImageReader(image_path)
+    reader.setAutoTransform(True)
+    size = reader.size()
+    if not size.isValid():
+        raise ValueError(reader.errorString() or "Unsupported image file.")
+    if max_dimension and max(size.width(), size.height()) > max_dimension:
+        size = size.scaled(QSize(max_dimension, max_dimension), Qt.KeepAspectRatio)
+        reader.setScaledSize(size)
+    return reader, size
+
+
+def _write_image(image, image_format, quality):
+    if image_format in ("jpeg", "jpg") and image.hasAlphaChannel():
+        # JPEG has no alpha channel; flatten onto white instead of black
+        flattened = QImage(image.size(), QImage.Format_RGB32)
+        flattened.fill(QColor("white"))
+        painter = QPainter(flattened)
+        painter.drawImage(0, 0, image)
+        painter.end()
+        image = flattened
+    buffer = QBuffer()
+    buffer.open(QIODevice.WriteOnly)
+    writer = QImageWriter(buffer, image_format.encode("ascii"))
+    writer.setQuality(quality)
+    if not writer.write(image):
+        raise ValueError(writer.errorString())
+    return bytes(buffer.data())
+
+
+def recompress_image(image_path, image_format=None, quality=80, max_dimension=0):
+    # Re-encode the image (optionally downscaled while decoding); None keeps
+    # the original format
+    reader, _ = _open_scaled_reader(image_path, max_dimension)
+    image_format = image_format or bytes(reader.format()).decode("ascii")
+    image = reader.read()
+    if image.isNull():
+        raise ValueError(reader.errorString())
+    return _write_image(image, image_format, quality)
+
+
+def estimate_recompressed_size(
+    image_path, image_format=None, quality=80, max_dimension=0
+):
+    # Encode only a centred SAMPLE_SIZE square and scale its bytes per pixel
+    # up to the whole image; returns the estimated Base64 length
+    reader, size = _open_scaled_reader(image_path, max_dimension)
+    image_format = image_format or bytes(reader.format()).decode("ascii")
+    sample = QRect(
+        0, 0, min(SAMPLE_SIZE, size.width()), min(SAMPLE_SIZE, size.height())
+    )
+    sample.moveCenter(QRect(QPoint(0, 0), size).center())
+    reader.setScaledClipRect(sample)
+    image = reader.read()
+    if image.isNull():
+        raise ValueError(reader.errorString())
+    sample_bytes = len(_write_image(image, image_format, quality))
+    pixels = size.width() * size.height()
+    estimated = sample_bytes * pixels / (image.width() * image.height())
+    return base64_length(int(estimated))
 
 
 def image_to_base64(image_path):
-    with open(image_path, "rb") as img_file:
-        encoded_string = base64.b64encode(img_file.read()).decode("utf-8")
-    return encoded_string
+    return b"".join(iter_base64_chunks(image_path)).decode("ascii")
+
+
+def format_size(num_bytes):
+    if num_bytes < 1024:
+        return f"{num_bytes} bytes"
+    size = num_bytes / 1024
+    for unit in ("KB", "MB"):
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def preview_text(encoded, limit=PREVIEW_CHARS):
+    if len(encoded) <= 2 * limit:
+        return encoded.decode("ascii")
+    head = bytes(encoded[:limit]).decode("ascii")
+    tail = bytes(encoded[-limit:]).decode("ascii")
+    omitted = len(encoded) - 2 * limit
+    return f"{head}\n\n... {omitted:,} characters omitted ...\n\n{tail}"
 
 
 class imageBase64EncoderApp(QMainWindow):
@@ -76,6 +228,58 @@ class imageBase64EncoderApp(QMainWindow):
         )
         main_layout.addWidget(self.pathField)
 
+        # Downscaled preview of the selected image
+        self.previewLabel = QLabel("No image selected")
+        self.previewLabel.setAlignment(Qt.AlignCenter)
+        self.previewLabel.setMinimumHeight(THUMBNAIL_SIZE.height())
+        self.previewLabel.setStyleSheet("font-size: 14px; color: #90A4AE;")
+        main_layout.addWidget(self.previewLabel)
+
+        # Optional re-encoding before Base64 to keep the output small
+        options_layout = QHBoxLayout()
+        options_layout.setSpacing(10)
+        options_style = "padding: 6px; border: 1px solid #B0BEC5; border-radius: 6px; font-size: 14px; background-color: #FFFFFF;"
+
+        self.formatComboBox = QComboBox()
+        self.formatComboBox.setStyleSheet(options_style)
+        self.formatComboBox.addItem("Original format", None)
+        writable = {bytes(f).decode() for f in QImageWriter.supportedImageFormats()}
+        for label, image_format in RECOMPRESS_FORMATS:
+            if image_format in writable:
+                self.formatComboBox.addItem(f"Re-encode as {label}", image_format)
+        options_layout.addWidget(self.formatComboBox)
+
+        self.qualitySpinBox = QSpinBox()
+        self.qualitySpinBox.setStyleSheet(options_style)
+        self.qualitySpinBox.setRange(1, 100)
+        self.qualitySpinBox.setValue(80)
+        self.qualitySpinBox.setPrefix("Quality ")
+        options_layout.addWidget(self.qualitySpinBox)
+
+        self.maxDimensionSpinBox = QSpinBox()
+        self.maxDimensionSpinBox.setStyleSheet(options_style)
+        self.maxDimensionSpinBox.setRange(0, 20000)
+        self.maxDimensionSpinBox.setSingleStep(100)
+        self.maxDimensionSpinBox.setPrefix("Max ")
+        self.maxDimensionSpinBox.setSuffix(" px")
+        self.maxDimensionSpinBox.setSpecialValueText("Original size")
+        options_layout.addWidget(self.maxDimensionSpinBox)
+
+        main_layout.addLayout(options_layout)
+
+        self.estimateLabel = QLabel("")
+        self.estimateLabel.setStyleSheet("font-size: 14px; color: #546E7A;")
+        main_layout.addWidget(self.estimateLabel)
+
+        # Re-estimate shortly after the options stop changing
+        self.estimateTimer = QTimer(self)
+        self.estimateTimer.setSingleShot(True)
+        self.estimateTimer.setInterval(300)
+        self.estimateTimer.timeout.connect(self.update_estimate)
+        self.formatComboBox.currentIndexChanged.connect(self.schedule_estimate)
+        self.qualitySpinBox.valueChanged.connect(self.schedule_estimate)
+        self.maxDimensionSpinBox.valueChanged.connect(self.schedule_estimate)
+
         # Button to encode image
         self.encodeButton = QPushButton("Encode to Base64")
         self.encodeButton.setStyleSheet(
@@ -96,6 +300,26 @@ class imageBase64EncoderApp(QMainWindow):
         self.encodeButton.clicked.connect(self.encode_image)
         main_layout.addWidget(self.encodeButton)
 
+        # Button to encode a whole folder into a data URI bundle
+        self.bundleButton = QPushButton("Encode Folder to Data URI Bundle")
+        self.bundleButton.setStyleSheet(
+            """
+            QPushButton {
+                background-color: #607D8B;
+                color: white;
+                padding: 12px;
+                border: none;
+                border-radius: 6px;
+                font-size: 16px;
+            }
+            QPushButton:hover {
+                background-color: #546E7A;
+            }
+            """
+        )
+        self.bundleButton.clicked.connect(self.encode_folder)
+        main_layout.addWidget(self.bundleButton)
+
         # Output field for Base64 result
         self.outputField = QTextEdit()
         self.outputField.setReadOnly(True)
@@ -107,6 +331,11 @@ class imageBase64EncoderApp(QMainWindow):
         )
         main_layout.addWidget(self.outputField)
 
+        # Total size of the encoded result (the field may show only part of it)
+        self.sizeLabel = QLabel("")
+        self.sizeLabel.setStyleSheet("font-size: 14px; color: #546E7A;")
+        main_layout.addWidget(self.sizeLabel)
+
         # Horizontal layout for Copy and Save buttons
         btn_layout = QHBoxLayout()
         btn_layout.setSpacing(20)
@@ -150,8 +379,70 @@ class imageBase64EncoderApp(QMainWindow):
         btn_layout.addWidget(self.saveButton)
 
         main_layout.addLayout(btn_layout)
+
+        # Decoding: paste Base64 / a data URI, or load it from a text file
+        self.decodeInputField = QTextEdit()
+        self.decodeInputField.setAcceptRichText(False)
+        self.decodeInputField.setPlaceholderText(
+            "Paste Base64 or a data URI here to decode it back to a file..."
+        )
+        self.decodeInputField.setStyleSheet(
+            "padding: 10px; border: 1px solid #B0BEC5; border-radius: 6px; font-size: 16px; background-color: #FFFFFF;"
+        )
+        main_layout.addWidget(self.decodeInputField)
+
+        decode_layout = QHBoxLayout()
+        decode_layout.setSpacing(20)
+
+        self.loadBase64Button = QPushButton("Load Base64 File")
+        self.loadBase64Button.setStyleSheet(
+            """
+            QPushButton {
+                background-color: #03A9F4;
+                color: white;
+                padding: 10px;
+                border: none;
+                border-radius: 6px;
+                font-size: 16px;
+            }
+            QPushButton:hover {
+                background-color: #0288D1;
+            }
+            """
+        )
+        self.loadBase64Button.clicked.connect(self.load_base64_file)
+        decode_layout.addWidget(self.loadBase64Button)
+
+        self.decodeButton = QPushButton("Decode to File")
+        self.decodeButton.setStyleSheet(
+            """
+            QPushButton {
+                background-color: #4CAF50;
+                color: white;
+                padding: 10px;
+                border: none;
+                border-radius: 6px;
+                font-size: 16px;
+            }
+            QPushButton:hover {
+                background-color: #43A047;
+            }
+            """
+        )
+        self.decodeButton.clicked.connect(self.decode_to_file)
+        decode_layout.addWidget(self.decodeButton)
+
+        main_layout.addLayout(decode_layout)
         self.setFont(QFont("Arial", 12))
 
+        # A loaded Base64 file is streamed from disk rather than shown
+        self.decodeSourcePath = None
+        self.decodeInputField.textChanged.connect(self.clear_decode_source)
+
+        # The full result lives here; copy and save read from this buffer
+        # rather than from the (truncated) output field
+        self.encoded = None
+
     def select_image(self):
         file_path, _ = QFileDialog.getOpenFileName(
             self,
@@ -161,7 +452,131 @@ class imageBase64EncoderApp(QMainWindow):
         )
         if file_path:
             self.pathField.setText(file_path)
-            self.outputField.clear()
+            self.clear_result()
+            self.show_preview(file_path)
+            self.update_estimate()
+
+    def show_preview(self, file_path):
+        self.previewLabel.clear()
+        self.previewLabel.setText("Loading preview...")
+        try:
+            mtime_ns = os.stat(file_path).st_mtime_ns
+        except OSError as e:
+            self.previewLabel.setText(f"No preview: {e.strerror}")
+            return
+        self.previewWorker = run_in_background(
+            self.load_preview,
+            file_path,
+            mtime_ns,
+            on_finished=self.preview_loaded,
+            on_failed=self.preview_failed,
+        )
+
+    @staticmethod
+    def load_preview(file_path, mtime_ns):
+        try:
+            return file_path, load_thumbnail(file_path, mtime_ns)
+        except ValueError:
+            return file_path, None
+
+    def preview_loaded(self, result):
+        file_path, image = result
+        # Ignore previews of images that are no longer selected
+        if file_path != self.pathField.text():
+            return
+        if image is None:
+            self.previewLabel.setText("No preview available for this file.")
+        else:
+            self.previewLabel.setPixmap(QPixmap.fromImage(image))
+
+    def preview_failed(self, error):
+        self.previewLabel.setText("No preview available for this file.")
+
+    def recompress_options(self):
+        return (
+            self.formatComboBox.currentData(),
+            self.qualitySpinBox.value(),
+            self.maxDimensionSpinBox.value(),
+        )
+
+    def update_estimate(self):
+        file_path = self.pathField.text().strip()
+        image_format, quality, max_dimension = self.recompress_options()
+        if not file_path:
+            return
+        if image_format is None and not max_dimension:
+            try:
+                size = base64_length(os.path.getsize(file_path))
+            except OSError:
+                return
+            self.estimateLabel.setText(f"Base64 size: {format_size(size)}")
+            return
+        self.estimateLabel.setText("Estimating size...")
+        self.estimateWorker = run_in_background(
+            self.estimate_size,
+            (file_path, image_format, quality, max_dimension),
+            on_finished=self.estimate_ready,
+        )
+
+    def schedule_estimate(self):
+        # Restart the timer; passing the signal's argument to start() would
+        # change its interval
+        self.estimateTimer.start()
+
+    @staticmethod
+    def estimate_size(request):
+        try:
+            return request, estimate_recompressed_size(*request)
+        except ValueError:
+            return request, None
+
+    def estimate_ready(self, result):
+        request, size = result
+        # Results for an older file or older options are dropped
+        if request != (self.pathField.text().strip(), *self.recompress_options()):
+            return
+        if size is None:
+            self.estimateLabel.setText("Size estimate unavailable for this file.")
+        else:
+            self.estimateLabel.setText(f"Estimated Base64 size: ~{format_size(size)}")
+
+    @staticmethod
+    def recompress_and_encode(file_path, image_format, quality, max_dimension):
+        data = recompress_image(file_path, image_format, quality, max_dimension)
+        return file_path, base64.b64encode(data)
+
+    @staticmethod
+    def encode_file(file_path):
+        return file_path, encode_file_to_buffer(file_path)
+
+    def encode_finished(self, result):
+        file_path, encoded = result
+        self.encodeButton.setEnabled(True)
+        if file_path != self.pathField.text().strip():
+            return
+        self.show_encoded(encoded)
+
+    def recompress_failed(self, error):
+        self.encodeButton.setEnabled(True)
+        self.outputField.clear()
+        QMessageBox.critical(
+            self, "Encoding Error", f"Failed to re-encode the image:\n{error}"
+        )
+
+    def encode_failed(self, error):
+        self.encodeButton.setEnabled(True)
+        self.outputField.clear()
+        QMessageBox.critical(
+            self, "Encoding Error", f"Failed to encode the image:\n{error}"
+        )
+
+    def show_encoded(self, encoded):
+        self.encoded = encoded
+        self.outputField.setPlainText(preview_text(self.encoded))
+        self.sizeLabel.setText(
+            f"Encoded size: {len(self.encoded):,} characters "
+            f"({format_size(len(self.encoded))})"
+        )
 
     def encode_image(self):
         file_path = self.pathField.text().strip()
@@ -170,27 +585,168 @@ class imageBase64EncoderApp(QMainWindow):
                 self, "Input Error", "Please select an image file first."
             )
             return
-        try:
-            encoded = image_to_base64(file_path)
-            self.outputField.setPlainText(encoded)
-        except Exception as e:
-            QMessageBox.critical(
-                self,
-                "Encoding Error",
-                f"Failed to encode the image:\n{str(e)}\n{traceback.format_exc()}",
+        image_format, quality, max_dimension = self.recompress_options()
+        # Reading and encoding a large file takes a while, and re-encoding the
+        # image even longer; do it on a worker so the window stays responsive
+        self.clear_result()
+        self.encodeButton.setEnabled(False)
+        if image_format is not None or max_dimension:
+            self.outputField.setPlainText("Re-encoding image...")
+            self.encodeWorker = run_in_background(
+                self.recompress_and_encode,
+                file_path,
+                image_format,
+                quality,
+                max_dimension,
+                on_finished=self.encode_finished,
+                on_failed=self.recompress_failed,
             )
+            return
+        self.outputField.setPlainText("Encoding image...")
+        self.encodeWorker = run_in_background(
+            self.encode_file,
+            file_path,
+            on_finished=self.encode_finished,
+            on_failed=self.encode_failed,
+        )
+
+    def encode_folder(self):
+        folder = QFileDialog.getExistingDirectory(self, "Select Asset Folder")
+        if not folder:
+            return
+        output_path, selected_filter = QFileDialog.getSaveFileName(
+            self,
+            "Save Data URI Bundle",
+            "",
+            "JSON Bundle (*.json);;CSS Bundle (*.css)",
+        )
+        if not output_path:
+            return
+        output_format = "css" if selected_filter.startswith("CSS") else "json"
+        # Hashing and encoding a whole folder takes a while; keep the window
+        # responsive while it runs
+        self.bundleButton.setEnabled(False)
+        self.bundleWorker = run_in_background(
+            self.build_bundle,
+            folder,
+            output_path,
+            output_format,
+            on_finished=self.bundle_finished,
+            on_failed=self.bundle_failed,
+        )
+
+    @staticmethod
+    def build_bundle(folder, output_path, output_format):
+        encoded, reused = build_data_uri_bundle(folder, output_path, output_format)
+        return output_path, encoded, reused
+
+    def bundle_finished(self, result):
+        output_path, encoded, reused = result
+        self.bundleButton.setEnabled(True)
+        QMessageBox.information(
+            self,
+            "Data URI Bundle",
+            f"Bundle saved to {output_path}.\n"
+            f"Encoded {encoded} file(s), reused {reused} unchanged file(s).",
+        )
+
+    def bundle_failed(self, error):
+        self.bundleButton.setEnabled(True)
+        QMessageBox.critical(
+            self, "Encoding Error", f"Failed to build the bundle:\n{error}"
+        )
+
+    def load_base64_file(self):
+        file_path, _ = QFileDialog.getOpenFileName(
+            self,
+            "Select Base64 File",
+            "",
+            "Text Files (*.txt *.b64);;All Files (*)",
+        )
+        if file_path:
+            self.decodeInputField.clear()
+            self.decodeSourcePath = file_path
+            self.decodeInputField.setPlaceholderText(f"Loaded: {file_path}")
+
+    def clear_decode_source(self):
+        if self.decodeSourcePath and not self.decodeInputField.document().isEmpty():
+            self.decodeSourcePath = None
+            self.decodeInputField.setPlaceholderText(
+                "Paste Base64 or a data URI here to decode it back to a file..."
+            )
+
+    def decode_to_file(self):
+        if self.decodeSourcePath:
+            chunks = iter_file_chunks(self.decodeSourcePath)
+        else:
+            text = self.decodeInputField.toPlainText()
+            if not text.strip():
+                QMessageBox.warning(
+                    self, "Input Error", "Please paste or load Base64 text first."
+                )
+                return
+            chunks = iter_text_chunks(text)
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "Save Decoded File", "", "All Files (*)"
+        )
+        if not file_path:
+            return
+        # Stream the decode on a worker so large inputs do not block the window
+        self.decodeButton.setEnabled(False)
+        self.decodeWorker = run_in_background(
+            self.decode_file,
+            chunks,
+            file_path,
+            on_finished=self.decode_finished,
+            on_failed=self.decode_failed,
+        )
+
+    @staticmethod
+    def decode_file(chunks, file_path):
+        written, mime_type = decode_base64_to_file(chunks, file_path)
+        return file_path, written, mime_type
+
+    def decode_finished(self, result):
+        file_path, written, mime_type = result
+        self.decodeButton.setEnabled(True)
+        message = (
+            f"Decoded {format_size(written)} to {file_path}.\n"
+            f"Detected type: {mime_type}"
+        )
+        extension = mimetypes.guess_extension(mime_type)
+        if extension and not file_path.lower().endswith(extension):
+            message += f" (usual extension: {extension})"
+        QMessageBox.information(self, "Decode Result", message)
+
+    def decode_failed(self, error):
+        self.decodeButton.setEnabled(True)
+        QMessageBox.critical(
+            self, "Decoding Error", f"Failed to decode Base64:\n{error}"
+        )
+
+    def clear_result(self):
+        self.encoded = None
+        self.outputField.clear()
+        self.sizeLabel.clear()
 
     def copy_result(self):
-        result_text = self.outputField.toPlainText()
-        if not result_text:
+        if not self.encoded:
             QMessageBox.information(self, "Copy Result", "No result available to copy.")
             return
-        QApplication.clipboard().setText(result_text)
+        try:
+            # Hand the clipboard raw bytes so no Python string copy is made
+            mime_data = QMimeData()
+            mime_data.setData("text/plain", QByteArray(self.encoded))
+            QApplication.clipboard().setMimeData(mime_data)
+        except Exception as e:
+            QMessageBox.critical(
+                self, "Copy Result", f"Failed to copy result:\n{str(e)}"
+            )
+            return
         QMessageBox.information(self, "Copy Result", "Result copied to clipboard.")
 
     def save_result(self):
-        result_text = self.outputField.toPlainText()
-        if not result_text:
+        if not self.encoded:
             QMessageBox.information(self, "Save Result", "No result available to save.")
             return
         file_path, _ = QFileDialog.getSaveFileName(
@@ -198,8 +754,8 @@ class imageBase64EncoderApp(QMainWindow):
         )
         if file_path:
             try:
-                with open(file_path, "w", encoding="utf-8") as file:
-                    file.write(result_text)
+                with open(file_path, "wb") as file:
+                    file.write(memoryview(self.encoded))
                 QMessageBox.information(
                     self, "Save Result", f"Result saved to {file_path}."
                 )
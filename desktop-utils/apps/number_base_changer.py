@@ -1,5 +1,5 @@
+import os
 import sys
-import traceback
 from PyQt5.QtWidgets import (
     QApplication,
     QMainWindow,
@@ -13,40 +13,60 @@ from PyQt5.QtWidgets import (
     QMessageBox,
     QFileDialog,
     QComboBox,
+    QCheckBox,
+    QPlainTextEdit,
+    QGridLayout,
 )
 from PyQt5.QtGui import QFont
-from PyQt5.QtCore import Qt
-
-# Mapping of base names to actual numeric base values
-BASE_MAP = {
-    "Binary": 2,
-    "Octal": 8,
-    "Decimal": 10,
-    "Hexadecimal": 16,
-}
-
-
-def convert_number(num_str, from_base, to_base):
-    # Convert from source base to integer
-    num_int = int(num_str, from_base)
-    # Convert integer to the target base representation
-    if to_base == 2:
-        return bin(num_int)
-    elif to_base == 8:
-        return oct(num_int)
-    elif to_base == 10:
-        return str(num_int)
-    elif to_base == 16:
-        return hex(num_int).upper().replace("X", "x")  # standard hex format
-    else:
-        raise ValueError("Unsupported target base.")
+from PyQt5.QtCore import Qt, QTimer
+
+if not __package__:
+    # Run directly as a script (python apps/<tool>.py): make the `apps`
+    # package importable from the project directory
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from apps.base_engine import (
+    BASE_MAP,
+    BYTE_ORDERS,
+    WORD_BITS,
+    cached_convert,
+    convert_number,
+    convert_number_file,
+    convert_number_lines,
+    fixed_width_text,
+    hex_file_word_table,
+    hex_word_table,
+)
+from apps.batch_report import report_batch
+from apps.workers import run_in_background
+
+# Targets updated as the user types
+LIVE_BASES = (
+    "Binary",
+    "Octal",
+    "Decimal",
+    "Hexadecimal",
+    "Base 36",
+    "Base58",
+    "Base62",
+)
+# Longer input is converted with the Convert button only
+LIVE_MAX_CHARS = 20000
+# Characters shown per live pane; the full result is one click away
+LIVE_PANE_CHARS = 2000
+
+
+def live_pane_text(text):
+    if len(text) <= LIVE_PANE_CHARS:
+        return text
+    return f"{text[:LIVE_PANE_CHARS]}... ({len(text):,} characters)"
 
 
 class NumberConverter(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Number Base Changer")
-        self.resize(600, 550)
+        self.resize(600, 800)
         self.setStyleSheet("background-color: #ECEFF1;")
 
         central_widget = QWidget()
@@ -67,12 +87,28 @@ class NumberConverter(QMainWindow):
 
         # Input field for the number
         self.inputField = QLineEdit()
-        self.inputField.setPlaceholderText("Enter a number (e.g. 1010, FF, 77, etc.)")
+        self.inputField.setPlaceholderText(
+            "Enter a number (e.g. 1010, FF, 77, Z3, etc.)"
+        )
         self.inputField.setStyleSheet(
             "padding: 10px; background: white;  border: 1px solid #B0BEC5; border-radius: 6px; font-size: 16px;"
         )
         main_layout.addWidget(self.inputField)
 
+        # Batch input: one number per line, shown instead of the single field
+        self.listInputField = QPlainTextEdit()
+        self.listInputField.setPlaceholderText("Paste numbers, one per line...")
+        self.listInputField.setStyleSheet(
+            "padding: 10px; background: white;  border: 1px solid #B0BEC5; border-radius: 6px; font-size: 16px;"
+        )
+        self.listInputField.setVisible(False)
+        main_layout.addWidget(self.listInputField)
+
+        self.batchCheckBox = QCheckBox("Batch: one number per line")
+        self.batchCheckBox.setStyleSheet("font-size: 14px; color: #263238;")
+        self.batchCheckBox.toggled.connect(self.toggle_batch_mode)
+        main_layout.addWidget(self.batchCheckBox)
+
         # Horizontal layout for "From" and "To" selections
         base_layout = QHBoxLayout()
         base_layout.setSpacing(20)
@@ -105,6 +141,59 @@ class NumberConverter(QMainWindow):
 
         main_layout.addLayout(base_layout)
 
+        # Live results in every common base, updated while typing
+        live_layout = QGridLayout()
+        live_layout.setHorizontalSpacing(10)
+        self.livePanes = {}
+        for row, name in enumerate(LIVE_BASES):
+            label = QLabel(f"{name}:")
+            label.setStyleSheet("font-size: 14px; color: #263238;")
+            pane = QLineEdit()
+            pane.setReadOnly(True)
+            pane.setStyleSheet(
+                "padding: 4px; background: #FFFFFF; border: 1px solid #CFD8DC; border-radius: 4px; font-size: 14px;"
+            )
+            live_layout.addWidget(label, row, 0)
+            live_layout.addWidget(pane, row, 1)
+            self.livePanes[name] = pane
+        main_layout.addLayout(live_layout)
+
+        self.liveStatusLabel = QLabel("")
+        self.liveStatusLabel.setStyleSheet("font-size: 14px; color: #546E7A;")
+        main_layout.addWidget(self.liveStatusLabel)
+
+        # Convert shortly after typing stops; only one live conversion runs
+        # at a time and input that arrives meanwhile is converted next
+        self.liveBusy = False
+        self.livePending = False
+        self.liveTimer = QTimer(self)
+        self.liveTimer.setSingleShot(True)
+        self.liveTimer.setInterval(150)
+        self.liveTimer.timeout.connect(self.update_live_panes)
+        self.inputField.textChanged.connect(self.schedule_live_update)
+        self.fromComboBox.currentIndexChanged.connect(self.schedule_live_update)
+
+        # Fixed-width mode: N-bit word views, and hex dumps as word tables
+        width_layout = QHBoxLayout()
+        width_layout.setSpacing(20)
+        self.widthComboBox = QComboBox()
+        self.widthComboBox.setStyleSheet(
+            "padding: 8px; border: 1px solid #B0BEC5; border-radius: 6px; font-size: 16px; background-color: #FFFFFF; color: #263238;"
+        )
+        self.widthComboBox.addItem("Any width", None)
+        for bits in WORD_BITS:
+            self.widthComboBox.addItem(f"{bits}-bit words", bits)
+        self.widthComboBox.currentIndexChanged.connect(self.update_placeholders)
+        width_layout.addWidget(self.widthComboBox)
+        self.byteOrderComboBox = QComboBox()
+        self.byteOrderComboBox.setStyleSheet(
+            "padding: 8px; border: 1px solid #B0BEC5; border-radius: 6px; font-size: 16px; background-color: #FFFFFF; color: #263238;"
+        )
+        for label, byteorder in BYTE_ORDERS.items():
+            self.byteOrderComboBox.addItem(label, byteorder)
+        width_layout.addWidget(self.byteOrderComboBox)
+        main_layout.addLayout(width_layout)
+
         # Convert Button
         self.convertButton = QPushButton("Convert")
         self.convertButton.setStyleSheet(
@@ -178,9 +267,134 @@ class NumberConverter(QMainWindow):
 
         main_layout.addLayout(btn_layout)
 
+        # Batch conversion of a file: a list of numbers or a CSV column
+        file_layout = QHBoxLayout()
+        file_layout.setSpacing(20)
+        self.csvColumnField = QLineEdit()
+        self.csvColumnField.setPlaceholderText(
+            "CSV column (empty: one number per line)"
+        )
+        self.csvColumnField.setStyleSheet(
+            "padding: 8px; background: white;  border: 1px solid #B0BEC5; border-radius: 6px; font-size: 14px;"
+        )
+        file_layout.addWidget(self.csvColumnField)
+        self.convertFileButton = QPushButton("Convert File...")
+        self.convertFileButton.setStyleSheet(
+            """
+            QPushButton {
+                background-color: #607D8B;
+                color: white;
+                padding: 10px;
+                border: none;
+                border-radius: 6px;
+                font-size: 16px;
+            }
+            QPushButton:hover {
+                background-color: #455A64;
+            }
+            """
+        )
+        self.convertFileButton.clicked.connect(self.convert_file)
+        file_layout.addWidget(self.convertFileButton)
+        main_layout.addLayout(file_layout)
+
+        self.batchStatusLabel = QLabel("")
+        self.batchStatusLabel.setWordWrap(True)
+        self.batchStatusLabel.setStyleSheet("font-size: 14px; color: #546E7A;")
+        main_layout.addWidget(self.batchStatusLabel)
+
         self.setFont(QFont("Arial", 12))
 
+    def schedule_live_update(self):
+        # Restart the timer; passing the signal's argument to start() would
+        # change its interval
+        self.liveTimer.start()
+
+    def live_request(self):
+        return self.inputField.text().strip(), self.fromComboBox.currentText()
+
+    def update_live_panes(self):
+        if self.liveBusy:
+            self.livePending = True
+            return
+        num_text, from_base_name = self.live_request()
+        if not num_text or len(num_text) > LIVE_MAX_CHARS:
+            for pane in self.livePanes.values():
+                pane.clear()
+            status = "Press Convert for numbers this long." if num_text else ""
+            self.liveStatusLabel.setText(status)
+            return
+        self.liveBusy = True
+        self.liveWorker = run_in_background(
+            self.live_convert,
+            (num_text, from_base_name),
+            on_finished=self.live_converted,
+            on_failed=self.live_failed,
+        )
+
+    @staticmethod
+    def live_convert(request):
+        num_text, from_base_name = request
+        from_base = BASE_MAP[from_base_name]
+        try:
+            results = [
+                (name, cached_convert(num_text, from_base, BASE_MAP[name]))
+                for name in LIVE_BASES
+            ]
+        except ValueError as e:
+            return request, None, str(e)
+        return request, results, None
+
+    def live_finished(self):
+        self.liveBusy = False
+        if self.livePending:
+            self.livePending = False
+            self.update_live_panes()
+
+    def live_converted(self, result):
+        request, results, error = result
+        self.live_finished()
+        # Results for input that has changed since are dropped
+        if request != self.live_request():
+            return
+        if error:
+            for pane in self.livePanes.values():
+                pane.clear()
+            self.liveStatusLabel.setText(error)
+            return
+        for name, text in results:
+            self.livePanes[name].setText(live_pane_text(text))
+            self.livePanes[name].setCursorPosition(0)
+        self.liveStatusLabel.setText("")
+
+    def live_failed(self, error):
+        self.live_finished()
+        self.liveStatusLabel.setText("Live conversion failed.")
+
+    def toggle_batch_mode(self, enabled):
+        self.inputField.setVisible(not enabled)
+        self.listInputField.setVisible(enabled)
+
+    def update_placeholders(self):
+        # With a word width selected, batch input and files are hex dumps
+        if self.widthComboBox.currentData():
+            self.listInputField.setPlaceholderText(
+                "Paste a hex dump (e.g. DE AD BE EF 00 01 ...)..."
+            )
+            self.csvColumnField.setEnabled(False)
+        else:
+            self.listInputField.setPlaceholderText("Paste numbers, one per line...")
+            self.csvColumnField.setEnabled(True)
+
+    def selected_bases(self):
+        from_base_name = self.fromComboBox.currentText()
+        to_base_name = self.toComboBox.currentText()
+        return BASE_MAP.get(from_base_name, 10), BASE_MAP.get(to_base_name, 10)
+
     def perform_conversion(self):
+        if self.batchCheckBox.isChecked():
+            self.convert_list()
+            return
         num_text = self.inputField.text().strip()
         if not num_text:
             QMessageBox.warning(
@@ -188,20 +402,140 @@ class NumberConverter(QMainWindow):
             )
             return
 
-        from_base_name = self.fromComboBox.currentText()
-        to_base_name = self.toComboBox.currentText()
-        from_base = BASE_MAP.get(from_base_name, 10)
-        to_base = BASE_MAP.get(to_base_name, 10)
+        from_base, to_base = self.selected_bases()
+        bits = self.widthComboBox.currentData()
+        if bits:
+            self.convertButton.setEnabled(False)
+            self.conversionWorker = run_in_background(
+                fixed_width_text,
+                num_text,
+                from_base,
+                bits,
+                on_finished=self.conversion_finished,
+                on_failed=self.conversion_failed,
+            )
+            return
 
-        try:
-            result = convert_number(num_text, from_base, to_base)
-            self.outputField.setPlainText(result)
-        except Exception as e:
-            QMessageBox.critical(
-                self,
-                "Conversion Error",
-                f"Failed to convert number:\n{str(e)}\n{traceback.format_exc()}",
+        # Numbers with hundreds of thousands of digits take a moment, so the
+        # conversion runs off the GUI thread
+        self.convertButton.setEnabled(False)
+        self.outputField.setPlainText("Converting...")
+        self.conversionWorker = run_in_background(
+            convert_number,
+            num_text,
+            from_base,
+            to_base,
+            on_finished=self.conversion_finished,
+            on_failed=self.conversion_failed,
+        )
+
+    def conversion_finished(self, result):
+        self.convertButton.setEnabled(True)
+        self.outputField.setPlainText(result)
+
+    def conversion_failed(self, error):
+        self.convertButton.setEnabled(True)
+        self.outputField.clear()
+        QMessageBox.critical(
+            self, "Conversion Error", f"Failed to convert number:\n{error}"
+        )
+
+    def convert_list(self):
+        lines = self.listInputField.toPlainText().splitlines()
+        if not any(line.strip() for line in lines):
+            QMessageBox.warning(self, "Input Error", "Please enter numbers to convert.")
+            return
+
+        from_base, to_base = self.selected_bases()
+        self.convertButton.setEnabled(False)
+        self.outputField.setPlainText("Converting...")
+        bits = self.widthComboBox.currentData()
+        if bits:
+            self.conversionWorker = run_in_background(
+                hex_word_table,
+                "\n".join(lines),
+                bits,
+                self.byteOrderComboBox.currentData(),
+                on_finished=self.conversion_finished,
+                on_failed=self.conversion_failed,
             )
+            return
+        self.conversionWorker = run_in_background(
+            convert_number_lines,
+            lines,
+            from_base,
+            to_base,
+            on_finished=self.list_converted,
+            on_failed=self.conversion_failed,
+        )
+
+    def list_converted(self, result):
+        converted, errors = result
+        self.convertButton.setEnabled(True)
+        self.outputField.setPlainText("\n".join(converted))
+        self.report_errors(len(converted), len(errors), errors)
+
+    def report_errors(self, total, error_count, errors):
+        report_batch(self, self.batchStatusLabel, "numbers", total, error_count, errors)
+
+    def convert_file(self):
+        bits = self.widthComboBox.currentData()
+        column = None if bits else self.csvColumnField.text().strip() or None
+        if column:
+            file_filter = "CSV Files (*.csv);;All Files (*)"
+        else:
+            file_filter = "Text Files (*.txt);;All Files (*)"
+        input_path, _ = QFileDialog.getOpenFileName(
+            self, "Select Numbers File", "", file_filter
+        )
+        if not input_path:
+            return
+        output_path, _ = QFileDialog.getSaveFileName(
+            self, "Save Converted Numbers", "", file_filter
+        )
+        if not output_path:
+            return
+        from_base, to_base = self.selected_bases()
+        self.convertFileButton.setEnabled(False)
+        self.batchStatusLabel.setText(f"Converting {input_path}...")
+        if bits:
+            self.fileWorker = run_in_background(
+                hex_file_word_table,
+                input_path,
+                output_path,
+                bits,
+                self.byteOrderComboBox.currentData(),
+                on_finished=self.words_decoded,
+                on_failed=self.file_failed,
+            )
+            return
+        self.fileWorker = run_in_background(
+            convert_number_file,
+            input_path,
+            output_path,
+            from_base,
+            to_base,
+            column,
+            on_finished=self.file_converted,
+            on_failed=self.file_failed,
+        )
+
+    def file_converted(self, result):
+        self.convertFileButton.setEnabled(True)
+        self.report_errors(*result)
+
+    def words_decoded(self, count):
+        self.convertFileButton.setEnabled(True)
+        self.batchStatusLabel.setText(f"Decoded {count:,} words.")
+
+    def file_failed(self, error):
+        self.convertFileButton.setEnabled(True)
+        self.batchStatusLabel.setText("Batch conversion failed.")
+        QMessageBox.critical(
+            self,
+            "Batch Conversion",
+            f"An error occurred during batch conversion:\n{error}",
+        )
 
     def copy_result(self):
         result_text = self.outputField.toPlainText()
@@ -0,0 +1,25 @@
+import collections
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+
+def process_pool(jobs=None):
+    # Spawn rather than fork a process that runs Qt threads. A spawned worker
+    # re-runs the main script as __mp_main__ and then imports the module that
+    # holds the task function, so entry points load the GUI inside main()
+    jobs = jobs or os.cpu_count() or 1
+    context = multiprocessing.get_context("spawn")
+    return ProcessPoolExecutor(jobs, mp_context=context), jobs
+
+
+def ordered_map(executor, function, argument_tuples, window):
+    # Like executor.map, but with at most `window` tasks in flight so a huge
+    # input is never queued up in memory all at once
+    pending = collections.deque()
+    for arguments in argument_tuples:
+        pending.append(executor.submit(function, *arguments))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
@@ -1,6 +1,6 @@
-import sys
-import urllib.parse
 import json
+import os
+import sys
 import traceback
 from PyQt5.QtWidgets import (
     QApplication,
@@ -13,17 +13,27 @@ from PyQt5.QtWidgets import (
     QTextEdit,
     QMessageBox,
     QFileDialog,
+    QComboBox,
+    QCheckBox,
+    QLabel,
 )
 from PyQt5.QtGui import QClipboard, QFont
 from PyQt5.QtCore import Qt
 
+if not __package__:
+    # Run directly as a script (python apps/<tool>.py): make the `apps`
+    # package importable from the project directory
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-def query_params_to_json(query_string):
-    # Parse the query string into a dictionary
-    parsed_params = urllib.parse.parse_qs(query_string)
-    # Convert the dictionary to a JSON object
-    json_object = {key: value[0] for key, value in parsed_params.items()}
-    return json.dumps(json_object, indent=4)
+from apps.query_parser import (
+    LOG_OUTPUTS,
+    PARSE_MODES,
+    build_query,
+    build_query_file,
+    extract_log_queries,
+    query_params_to_json,
+)
+from apps.workers import run_in_background
 
 
 class queryParmApp(QMainWindow):
@@ -58,7 +68,23 @@ class queryParmApp(QMainWindow):
         )
         main_layout.addWidget(self.inputField)
 
-        # Convert button
+        # Options: how repeated keys are combined, and output layout
+        options_layout = QHBoxLayout()
+        options_layout.setSpacing(10)
+        self.modeComboBox = QComboBox()
+        self.modeComboBox.setStyleSheet(
+            "padding: 6px; border: 1px solid #ccc; border-radius: 4px; font-size: 14px;"
+        )
+        for label, mode in PARSE_MODES.items():
+            self.modeComboBox.addItem(label, mode)
+        options_layout.addWidget(self.modeComboBox)
+        self.compactCheckBox = QCheckBox("Compact JSON")
+        options_layout.addWidget(self.compactCheckBox)
+        main_layout.addLayout(options_layout)
+
+        # Convert (query -> JSON) and Build Query (JSON -> query) buttons
+        convert_layout = QHBoxLayout()
+        convert_layout.setSpacing(10)
         self.convertButton = QPushButton("Convert")
         self.convertButton.setStyleSheet(
             """
@@ -76,12 +102,34 @@ class queryParmApp(QMainWindow):
             """
         )
         self.convertButton.clicked.connect(self.convert_query)
-        main_layout.addWidget(self.convertButton)
+        convert_layout.addWidget(self.convertButton)
+
+        self.buildQueryButton = QPushButton("Build Query")
+        self.buildQueryButton.setStyleSheet(
+            """
+            QPushButton {
+                background-color: #FF9800;
+                color: white;
+                padding: 10px;
+                border: none;
+                border-radius: 4px;
+                font-size: 14px;
+            }
+            QPushButton:hover {
+                background-color: #e68900;
+            }
+            """
+        )
+        self.buildQueryButton.clicked.connect(self.build_query_string)
+        convert_layout.addWidget(self.buildQueryButton)
+        main_layout.addLayout(convert_layout)
 
         # Output display field for JSON result
         self.outputField = QTextEdit()
-        self.outputField.setReadOnly(True)
-        self.outputField.setPlaceholderText("Converted JSON will be shown here...")
+        # Editable, so JSON can also be pasted here and built into a query
+        self.outputField.setPlaceholderText(
+            "Converted JSON will be shown here (or paste JSON to build a query)..."
+        )
         self.outputField.setStyleSheet(
             "padding: 8px; border: 1px solid #ccc; border-radius: 4px; font-size: 14px;"
         )
@@ -131,6 +179,60 @@ class queryParmApp(QMainWindow):
 
         main_layout.addLayout(btn_layout)
 
+        # Batch extraction of every query string in an access log
+        log_layout = QHBoxLayout()
+        log_layout.setSpacing(10)
+        self.logOutputComboBox = QComboBox()
+        self.logOutputComboBox.setStyleSheet(
+            "padding: 6px; border: 1px solid #ccc; border-radius: 4px; font-size: 14px;"
+        )
+        for label, output in LOG_OUTPUTS.items():
+            self.logOutputComboBox.addItem(label, output)
+        log_layout.addWidget(self.logOutputComboBox)
+        self.extractLogButton = QPushButton("Extract From Access Log...")
+        self.extractLogButton.setStyleSheet(
+            """
+            QPushButton {
+                background-color: #607D8B;
+                color: white;
+                padding: 8px;
+                border: none;
+                border-radius: 4px;
+                font-size: 14px;
+            }
+            QPushButton:hover {
+                background-color: #455A64;
+            }
+            """
+        )
+        self.extractLogButton.clicked.connect(self.extract_log)
+        log_layout.addWidget(self.extractLogButton)
+
+        self.buildFileButton = QPushButton("Build Queries From JSON File...")
+        self.buildFileButton.setStyleSheet(
+            """
+            QPushButton {
+                background-color: #607D8B;
+                color: white;
+                padding: 8px;
+                border: none;
+                border-radius: 4px;
+                font-size: 14px;
+            }
+            QPushButton:hover {
+                background-color: #455A64;
+            }
+            """
+        )
+        self.buildFileButton.clicked.connect(self.build_query_file)
+        log_layout.addWidget(self.buildFileButton)
+        main_layout.addLayout(log_layout)
+
+        self.batchStatusLabel = QLabel("")
+        self.batchStatusLabel.setWordWrap(True)
+        self.batchStatusLabel.setStyleSheet("font-size: 13px; color: #555;")
+        main_layout.addWidget(self.batchStatusLabel)
+
         # Set general application font
         self.setFont(QFont("Arial", 10))
 
@@ -141,7 +243,11 @@ class queryParmApp(QMainWindow):
             return
 
         try:
-            json_result = query_params_to_json(query_string)
+            json_result = query_params_to_json(
+                query_string,
+                self.modeComboBox.currentData(),
+                None if self.compactCheckBox.isChecked() else 4,
+            )
             self.outputField.setPlainText(json_result)
         except Exception as e:
             QMessageBox.critical(
@@ -150,6 +256,25 @@ class queryParmApp(QMainWindow):
                 f"An error occurred:\n{str(e)}\n\n{traceback.format_exc()}",
             )
 
+    def list_style(self):
+        # The nested parse mode reads "key[]" back as a list; the others
+        # expect urlencode's repeated keys
+        if self.modeComboBox.currentData() == "nested":
+            return "brackets"
+        return "repeat"
+
+    def build_query_string(self):
+        json_text = self.outputField.toPlainText().strip()
+        if not json_text:
+            QMessageBox.warning(self, "Input Error", "Please enter a JSON object.")
+            return
+
+        try:
+            params = json.loads(json_text)
+            self.inputField.setText(build_query(params, self.list_style()))
+        except ValueError as e:
+            QMessageBox.critical(self, "Build Error", f"Invalid input:\n{str(e)}")
+
     def copy_json(self):
         json_text = self.outputField.toPlainText()
         if not json_text:
@@ -180,6 +305,90 @@ class queryParmApp(QMainWindow):
                     self, "Save JSON", f"Failed to save JSON:\n{str(e)}"
                 )
 
+    def extract_log(self):
+        log_path, _ = QFileDialog.getOpenFileName(
+            self,
+            "Select Access Log",
+            "",
+            "Log Files (*.log *.gz *.txt);;All Files (*)",
+        )
+        if not log_path:
+            return
+        output = self.logOutputComboBox.currentData()
+        if output == "ndjson":
+            file_filter = "NDJSON Files (*.ndjson *.jsonl);;All Files (*)"
+        else:
+            file_filter = "JSON Files (*.json);;All Files (*)"
+        output_path, _ = QFileDialog.getSaveFileName(
+            self, "Save Extracted Queries", "", file_filter
+        )
+        if not output_path:
+            return
+        self.extractLogButton.setEnabled(False)
+        self.batchStatusLabel.setText(f"Scanning {log_path}...")
+        self.logWorker = run_in_background(
+            extract_log_queries,
+            log_path,
+            output_path,
+            output,
+            self.modeComboBox.currentData(),
+            on_finished=self.log_extracted,
+            on_failed=self.log_failed,
+        )
+
+    def log_extracted(self, requests):
+        self.extractLogButton.setEnabled(True)
+        self.batchStatusLabel.setText(
+            f"Extracted the query strings of {requests:,} requests."
+        )
+
+    def log_failed(self, error):
+        self.extractLogButton.setEnabled(True)
+        self.batchStatusLabel.setText("Log extraction failed.")
+        QMessageBox.critical(
+            self,
+            "Log Extraction",
+            f"An error occurred while reading the log:\n{error}",
+        )
+
+    def build_query_file(self):
+        input_path, _ = QFileDialog.getOpenFileName(
+            self,
+            "Select JSON File",
+            "",
+            "JSON Files (*.json *.ndjson *.jsonl);;All Files (*)",
+        )
+        if not input_path:
+            return
+        output_path, _ = QFileDialog.getSaveFileName(
+            self, "Save Query Strings", "", "Text Files (*.txt);;All Files (*)"
+        )
+        if not output_path:
+            return
+        self.buildFileButton.setEnabled(False)
+        self.batchStatusLabel.setText(f"Building query strings from {input_path}...")
+        self.buildWorker = run_in_background(
+            build_query_file,
+            input_path,
+            output_path,
+            self.list_style(),
+            on_finished=self.queries_built,
+            on_failed=self.build_failed,
+        )
+
+    def queries_built(self, count):
+        self.buildFileButton.setEnabled(True)
+        self.batchStatusLabel.setText(f"Wrote {count:,} query strings.")
+
+    def build_failed(self, error):
+        self.buildFileButton.setEnabled(True)
+        self.batchStatusLabel.setText("Building query strings failed.")
+        QMessageBox.critical(
+            self,
+            "Build Queries",
+            f"An error occurred while building query strings:\n{error}",
+        )
+
 
 def main():
     app = QApplication(sys.argv)
@@ -0,0 +1,300 @@
+import contextlib
+import gzip
+import itertools
+import json
+import re
+from collections import Counter
+
+from apps.formats import read_json
+from apps.parallel import ordered_map, process_pool
+from apps.url_codec import get_encoder
+
+# How repeated keys are combined, as shown in the Query Params tool
+PARSE_MODES = {
+    "First value": "first",
+    "Last value wins": "last",
+    "All values as lists": "list",
+    "Nested brackets (a[b][]=1)": "nested",
+}
+
+# Bytes of log text handed to a worker process at a time
+LOG_BLOCK_SIZE = 8 << 20
+
+# Most frequent values kept per key in a key/value count summary
+TOP_VALUES = 100
+
+# What batch extraction from an access log writes
+LOG_OUTPUTS = {
+    "Queries as NDJSON": "ndjson",
+    "Key/value counts": "counts",
+}
+
+# How lists are written when building a query string from JSON: "repeat"
+# follows urlencode(doseq=True) (tag=a&tag=b), "brackets" marks them the way
+# the nested parse mode reads them back (tag[]=a&tag[]=b)
+LIST_STYLES = ("repeat", "brackets")
+
+# The query string of the quoted request line in common/combined log format,
+# e.g. "GET /search?q=x HTTP/1.1"; absolute proxy URLs match too
+_REQUEST_QUERY = re.compile(rb'"[A-Z]+ [^"?\s]*\?([^"\s#]*)')
+_BRACKETS = re.compile(r"\[([^\[\]]*)\]")
+_ESCAPE_RUN = re.compile(r"(?:%[0-9A-Fa-f]{2})+")
+
+
+def _decode_escapes(match):
+    return bytes.fromhex(match.group().replace("%", "")).decode("utf-8", "replace")
+
+
+def _unquote(token):
+    # Same result as urllib.parse.unquote_plus, but each run of escapes is
+    # decoded with one bytes.fromhex call; most tokens need no work at all
+    if "+" in token:
+        token = token.replace("+", " ")
+    if "%" not in token:
+        return token
+    return _ESCAPE_RUN.sub(_decode_escapes, token)
+
+
+def iter_query_pairs(query_string):
+    # Single pass over the query string yielding decoded (key, value) pairs;
+    # blank values are kept and a key without '=' gets an empty value
+    if query_string.startswith("?"):
+        query_string = query_string[1:]
+    for token in query_string.split("&"):
+        if not token:
+            continue
+        key, _, value = token.partition("=")
+        yield _unquote(key), _unquote(value)
+
+
+def _split_key(key):
+    # "a[b][]" -> ["a", "b", ""]; keys that are not clean bracket notation
+    # are kept whole
+    base_end = key.find("[")
+    if base_end <= 0:
+        return [key]
+    segments = [key[:base_end]]
+    pos = base_end
+    for match in _BRACKETS.finditer(key, base_end):
+        if match.start() != pos:
+            return [key]
+        segments.append(match.group(1))
+        pos = match.end()
+    if pos != len(key):
+        return [key]
+    return segments
+
+
+def _insert_nested(root, key, value):
+    segments = _split_key(key)
+    container = root
+    for segment, next_segment in zip(segments, segments[1:] + [None]):
+        if isinstance(container, list):
+            # Only "[]" leads into a list; it always appends a new element
+            if next_segment is None:
+                container.append(value)
+                return
+            child = [] if next_segment == "" else {}
+            container.append(child)
+            container = child
+            continue
+        if next_segment is None:
+            container[segment] = value
+            return
+        expected = list if next_segment == "" else dict
+        child = container.get(segment)
+        if not isinstance(child, expected):
+            child = expected()
+            container[segment] = child
+        container = child
+
+
+def parse_query(query_string, mode="first"):
+    result = {}
+    pairs = iter_query_pairs(query_string)
+    if mode == "first":
+        for key, value in pairs:
+            result.setdefault(key, value)
+    elif mode == "last":
+        for key, value in pairs:
+            result[key] = value
+    elif mode == "list":
+        for key, value in pairs:
+            values = result.get(key)
+            if values is None:
+                result[key] = [value]
+            else:
+                values.append(value)
+    elif mode == "nested":
+        for key, value in pairs:
+            _insert_nested(result, key, value)
+    else:
+        raise ValueError(f"Unsupported parse mode: {mode}")
+    return result
+
+
+def query_params_to_json(query_string, mode="first", indent=4):
+    return json.dumps(parse_query(query_string, mode), indent=indent)
+
+
+def open_log(log_path):
+    # Gzip-rotated logs are recognised by their magic number, not the name
+    with open(log_path, "rb") as log_file:
+        magic = log_file.read(2)
+    if magic == b"\x1f\x8b":
+        return gzip.open(log_path, "rb")
+    return open(log_path, "rb")
+
+
+def iter_log_queries(block):
+    for match in _REQUEST_QUERY.finditer(block):
+        yield match.group(1).decode("utf-8", "replace")
+
+
+def scan_log_block(block, output, mode):
+    # Returns (request count, NDJSON text) or (request count, Counter of
+    # (key, value) pairs) for one block of whole log lines
+    queries = list(iter_log_queries(block))
+    if output == "ndjson":
+        lines = [
+            json.dumps(parse_query(query, mode), ensure_ascii=False) + "\n"
+            for query in queries
+        ]
+        return len(queries), "".join(lines)
+    counts = Counter()
+    for query in queries:
+        counts.update(iter_query_pairs(query))
+    return len(queries), counts
+
+
+def summarize_counts(counts, top=TOP_VALUES):
+    # {key: {"count", "distinct", "values"}}, most used keys and values first
+    by_key = {}
+    for (key, value), count in counts.items():
+        by_key.setdefault(key, Counter())[value] = count
+    totals = {key: sum(values.values()) for key, values in by_key.items()}
+    return {
+        key: {
+            "count": totals[key],
+            "distinct": len(by_key[key]),
+            "values": dict(by_key[key].most_common(top)),
+        }
+        for key in sorted(by_key, key=totals.get, reverse=True)
+    }
+
+
+def _log_blocks(log_file, block_size):
+    while True:
+        block = log_file.read(block_size)
+        if not block:
+            return
+        # Finish the last line so no request is split between two blocks
+        yield block + log_file.readline()
+
+
+def extract_log_queries(
+    log_path, output_path, output="ndjson", mode="first", jobs=None
+):
+    # Pull the query string out of every request in an access log (plain or
+    # gzip) and write them as NDJSON, or as key/value frequency counts.
+    # Blocks of whole lines are scanned by worker processes and their
+    # counters merged here. Returns the number of requests with a query.
+    if output not in LOG_OUTPUTS.values():
+        raise ValueError(f"Unsupported log output: {output}")
+    requests = 0
+    counts = Counter()
+    with open_log(log_path) as log_file, open(
+        output_path, "w", encoding="utf-8", newline="\n"
+    ) as output_file:
+        blocks = _log_blocks(log_file, LOG_BLOCK_SIZE)
+        head = list(itertools.islice(blocks, 2))
+        if len(head) < 2:
+            # Small logs are not worth starting worker processes for
+            executor = contextlib.nullcontext()
+            results = [scan_log_block(block, output, mode) for block in head]
+        else:
+            executor, jobs = process_pool(jobs)
+            arguments = (
+                (block, output, mode) for block in itertools.chain(head, blocks)
+            )
+            results = ordered_map(executor, scan_log_block, arguments, 2 * jobs)
+        with executor:
+            for count, result in results:
+                requests += count
+                if output == "ndjson":
+                    output_file.write(result)
+                else:
+                    counts.update(result)
+        if output == "counts":
+            summary = {"requests": requests, "keys": summarize_counts(counts)}
+            json.dump(summary, output_file, indent=4, ensure_ascii=False)
+    return requests
+
+
+def _scalar_text(value):
+    # JSON literals keep their JSON spelling; null becomes an empty value
+    if value is None:
+        return ""
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    return str(value)
+
+
+def iter_flat_params(value, key="", list_style="repeat"):
+    # Flatten nested JSON into (key, value) pairs with bracket-nested keys:
+    # {"a": {"b": 1}} -> a[b]=1. Lists of scalars are repeated keys (or
+    # key[]); anything nested inside a list is indexed, a[0][b], so each
+    # element stays together.
+    if isinstance(value, dict):
+        for name, item in value.items():
+            yield from iter_flat_params(
+                item, f"{key}[{name}]" if key else str(name), list_style
+            )
+    elif isinstance(value, list):
+        for index, item in enumerate(value):
+            if isinstance(item, (dict, list)):
+                yield from iter_flat_params(item, f"{key}[{index}]", list_style)
+            elif list_style == "brackets":
+                yield f"{key}[]", _scalar_text(item)
+            else:
+                yield key, _scalar_text(item)
+    else:
+        yield key, _scalar_text(value)
+
+
+def build_query(params, list_style="repeat"):
+    # Inverse of parse_query: a JSON object to an application/x-www-form-
+    # urlencoded query string, encoded like urllib.parse.urlencode
+    if not isinstance(params, dict):
+        raise ValueError("Only a JSON object can be turned into a query string.")
+    if list_style not in LIST_STYLES:
+        raise ValueError(f"Unsupported list style: {list_style}")
+    encode = get_encoder("form")
+    return "&".join(
+        f"{encode(key)}={encode(value)}"
+        for key, value in iter_flat_params(params, list_style=list_style)
+    )
+
+
+def iter_query_strings(json_file, list_style="repeat"):
+    # One query string per object of a JSON object, array or NDJSON stream,
+    # read incrementally so large replay fixtures never sit in memory
+    for number, params in enumerate(read_json(json_file), 1):
+        if not isinstance(params, dict):
+            raise ValueError(f"Item {number} is not a JSON object.")
+        yield build_query(params, list_style)
+
+
+def build_query_file(input_path, output_path, list_style="repeat"):
+    # Write the query strings one per line; returns how many were written
+    count = 0
+    with open(input_path, "r", encoding="utf-8") as json_file, open(
+        output_path, "w", encoding="utf-8", newline="\n"
+    ) as output_file:
+        for query_string in iter_query_strings(json_file, list_style):
+            output_file.write(query_string)
+            output_file.write("\n")
+            count += 1
+    return count
@@ -0,0 +1,233 @@
+import re
+import string
+import urllib.parse
+from functools import lru_cache
+
+from apps.batch import convert_lines_file
+from apps.parallel import ordered_map, process_pool
+
+# Lines handed to a worker process at a time in batch conversions
+WORKER_BATCH_LINES = 20000
+
+
+# Characters never percent-encoded (RFC 3986 unreserved), as in urllib
+ALWAYS_SAFE = string.ascii_letters + string.digits + "_.-~"
+
+# Extra safe characters and space handling per URL component. "path" and
+# "form" match urllib.parse.quote and quote_plus with their default safe sets.
+COMPONENT_MODES = {
+    "path": ("/", False),
+    "query": ("/?:@", False),
+    "component": ("", False),
+    "form": ("", True),
+}
+
+
+class PercentEncoder:
+    # Percent-encoder driven by a 256-entry table built once per safe set,
+    # so encoding is a single join with no per-call setup
+
+    def __init__(self, safe="/", plus_spaces=False):
+        safe_bytes = frozenset((ALWAYS_SAFE + safe).encode("ascii"))
+        self.table = [
+            chr(byte) if byte in safe_bytes else f"%{byte:02X}" for byte in range(256)
+        ]
+        if plus_spaces:
+            self.table[ord(" ")] = "+"
+        self.safe = bytes(sorted(safe_bytes))
+        # Same table, but newlines survive so many lines encode in one pass
+        self.line_table = list(self.table)
+        self.line_table[ord("\n")] = "\n"
+        self.line_safe = self.safe + b"\n"
+
+    def __call__(self, text):
+        data = text.encode("utf-8")
+        # Fast path: nothing left after deleting the safe bytes
+        if not data.translate(None, self.safe):
+            return text
+        return "".join(map(self.table.__getitem__, data))
+
+    def encode_lines(self, lines):
+        data = "\n".join(lines).encode("utf-8")
+        if not data.translate(None, self.line_safe):
+            return list(lines)
+        return "".join(map(self.line_table.__getitem__, data)).split("\n")
+
+
+# Columns shown by the URL inspector
+URL_COLUMNS = ["Scheme", "User Info", "Host", "Port", "Path", "Query", "Fragment"]
+
+# Characters left alone in each part of a full URL (RFC 3986 sub-delims plus
+# what the part allows); '&' and '=' are handled by splitting the query
+_SUB_DELIMS = "!$'()*+,;"
+_PART_SAFE = {
+    "userinfo": _SUB_DELIMS + "=:",
+    "path": _SUB_DELIMS + "=:@/",
+    "query": _SUB_DELIMS + ":@/?",
+    "fragment": _SUB_DELIMS + "=:@/?&",
+}
+_PERCENT_ESCAPE = re.compile(r"(%[0-9A-Fa-f]{2})")
+
+
+@lru_cache(maxsize=32)
+def get_encoder(mode="path", safe=None):
+    default_safe, plus_spaces = COMPONENT_MODES[mode]
+    return PercentEncoder(default_safe if safe is None else safe, plus_spaces)
+
+
+def url_encode(text):
+    return urllib.parse.quote(text)
+
+
+def url_decode(text):
+    return urllib.parse.unquote(text)
+
+
+def _encode_part(text, part):
+    # Existing %XX escapes are kept so already-encoded URLs are not encoded
+    # twice; everything else goes through the part's encoder
+    encode = get_encoder("path", _PART_SAFE[part])
+    pieces = _PERCENT_ESCAPE.split(text)
+    pieces[::2] = map(encode, pieces[::2])
+    return "".join(pieces)
+
+
+def _split_netloc(netloc):
+    userinfo, _, hostport = netloc.rpartition("@")
+    if hostport.startswith("["):
+        host, _, port = hostport.partition("]")
+        return userinfo, host + "]", port.lstrip(":")
+    host, _, port = hostport.partition(":")
+    return userinfo, host, port
+
+
+def split_url(url):
+    # Split once into the inspector columns
+    parts = urllib.parse.urlsplit(url)
+    userinfo, host, port = _split_netloc(parts.netloc)
+    return [
+        parts.scheme,
+        userinfo,
+        host,
+        port,
+        parts.path,
+        parts.query,
+        parts.fragment,
+    ]
+
+
+def _join_url(scheme, userinfo, host, port, path, query, fragment):
+    netloc = host
+    if userinfo:
+        netloc = f"{userinfo}@{netloc}"
+    if port:
+        netloc = f"{netloc}:{port}"
+    return urllib.parse.urlunsplit((scheme, netloc, path, query, fragment))
+
+
+def encode_url_components(components):
+    scheme, userinfo, host, port, path, query, fragment = components
+    if host and not host.isascii() and not host.startswith("["):
+        host = host.encode("idna").decode("ascii")
+    pairs = []
+    for pair in query.split("&") if query else []:
+        key, sep, value = pair.partition("=")
+        pairs.append(_encode_part(key, "query") + sep + _encode_part(value, "query"))
+    return [
+        scheme,
+        _encode_part(userinfo, "userinfo"),
+        host,
+        port,
+        _encode_part(path, "path"),
+        "&".join(pairs),
+        _encode_part(fragment, "fragment"),
+    ]
+
+
+def decode_url_components(components):
+    scheme, userinfo, host, port, path, query, fragment = components
+    if host.lower().startswith("xn--") or ".xn--" in host.lower():
+        host = host.encode("ascii").decode("idna")
+    pairs = []
+    for pair in query.split("&") if query else []:
+        key, sep, value = pair.partition("=")
+        pairs.append(url_decode(key) + sep + url_decode(value))
+    return [
+        scheme,
+        url_decode(userinfo),
+        host,
+        port,
+        url_decode(path),
+        "&".join(pairs),
+        url_decode(fragment),
+    ]
+
+
+def process_urls(lines, mode):
+    # Full-URL mode: split every URL once, encode or decode each component
+    # with its own rules and reassemble. Returns (result, components, error)
+    # rows; rows that fail keep the original URL.
+    convert = encode_url_components if mode == "encode" else decode_url_components
+    rows = []
+    for line in lines:
+        try:
+            components = convert(split_url(line))
+            rows.append((_join_url(*components), components, None))
+        except (UnicodeError, ValueError) as e:
+            rows.append((line, [""] * len(URL_COLUMNS), str(e)))
+    return rows
+
+
+def _strict_decode(text):
+    # Report percent-escapes that are not valid UTF-8 instead of silently
+    # replacing them
+    return urllib.parse.unquote(text, errors="strict")
+
+
+CONVERTERS = {"encode": url_encode, "decode": _strict_decode}
+
+
+def convert_lines(lines, mode, first_line=1):
+    # Returns the converted lines and (line number, message) pairs; a line
+    # that fails is passed through unchanged so the output stays aligned
+    if mode == "encode":
+        try:
+            # Same output as url_encode, for the whole batch in one pass
+            return get_encoder("path").encode_lines(lines), []
+        except UnicodeError:
+            pass  # find the failing lines one by one below
+    function = CONVERTERS[mode]
+    converted = []
+    errors = []
+    for line_number, line in enumerate(lines, first_line):
+        try:
+            converted.append(function(line))
+        except (UnicodeError, ValueError) as e:
+            converted.append(line)
+            errors.append((line_number, str(e)))
+    return converted, errors
+
+
+def convert_url_file(input_path, output_path, mode, jobs=None):
+    # Stream a file of one URL per line through encode or decode. Returns
+    # (line count, error count, reported errors).
+    if mode not in CONVERTERS:
+        raise ValueError(f"Unsupported mode: {mode}")
+    executor, jobs = process_pool(jobs)
+
+    def map_batches(function, batches):
+        arguments = ((lines, mode, first_line) for lines, first_line in batches)
+        return ordered_map(executor, function, arguments, 2 * jobs)
+
+    with executor:
+        # surrogateescape lets lines with invalid UTF-8 reach the per-line
+        # error report (and pass through unchanged) instead of aborting the
+        # whole file
+        return convert_lines_file(
+            input_path,
+            output_path,
+            convert_lines,
+            map_batches,
+            WORKER_BATCH_LINES,
+            errors="surrogateescape",
+        )
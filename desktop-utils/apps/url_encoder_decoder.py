@@ -1,5 +1,5 @@
+import os
 import sys
-import urllib.parse
 import traceback
 from PyQt5.QtWidgets import (
     QApplication,
@@ -12,17 +12,32 @@ from PyQt5.QtWidgets import (
     QTextEdit,
     QMessageBox,
     QFileDialog,
+    QPlainTextEdit,
+    QLabel,
+    QCheckBox,
+    QTableWidget,
+    QTableWidgetItem,
 )
 from PyQt5.QtGui import QFont, QClipboard
 from PyQt5.QtCore import Qt
 
+if not __package__:
+    # Run directly as a script (python apps/<tool>.py): make the `apps`
+    # package importable from the project directory
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-def url_encode(text):
-    return urllib.parse.quote(text)
-
+from apps.url_codec import (
+    URL_COLUMNS,
+    convert_url_file,
+    process_urls,
+    url_decode,
+    url_encode,
+)
+from apps.batch_report import report_batch
+from apps.workers import run_in_background
 
-def url_decode(text):
-    return urllib.parse.unquote(text)
+# Rows shown in the component table; the output field always has every URL
+MAX_TABLE_ROWS = 5000
 
 
 class urlEncoderDecoderApp(QMainWindow):
@@ -47,14 +62,25 @@ class urlEncoderDecoderApp(QMainWindow):
         )
         main_layout.addWidget(self.headerField)
 
-        # Text input field
-        self.inputField = QLineEdit()
-        self.inputField.setPlaceholderText("Enter URL string to encode or decode...")
+        # Text input field; every line is converted separately
+        self.inputField = QPlainTextEdit()
+        self.inputField.setPlaceholderText(
+            "Enter URL strings to encode or decode, one per line..."
+        )
+        self.inputField.setMaximumHeight(120)
         self.inputField.setStyleSheet(
             "padding: 8px; border: 1px solid #ccc; border-radius: 4px; font-size: 14px;"
         )
         main_layout.addWidget(self.inputField)
 
+        # Full-URL mode splits each URL and converts component by component,
+        # so '://', '?' and '&' survive encoding
+        self.fullUrlCheckBox = QCheckBox(
+            "Full URL mode (encode/decode each component separately)"
+        )
+        self.fullUrlCheckBox.toggled.connect(self.toggle_full_url_mode)
+        main_layout.addWidget(self.fullUrlCheckBox)
+
         # Buttons layout: Encode and Decode
         action_layout = QHBoxLayout()
         action_layout.setSpacing(10)
@@ -99,6 +125,39 @@ class urlEncoderDecoderApp(QMainWindow):
 
         main_layout.addLayout(action_layout)
 
+        # Batch buttons: stream a file with one URL per line
+        batch_layout = QHBoxLayout()
+        batch_layout.setSpacing(10)
+
+        self.encodeFileButton = QPushButton("Encode File...")
+        self.decodeFileButton = QPushButton("Decode File...")
+        for button in (self.encodeFileButton, self.decodeFileButton):
+            button.setStyleSheet(
+                """
+                QPushButton {
+                    background-color: #607D8B;
+                    color: white;
+                    padding: 10px;
+                    border: none;
+                    border-radius: 4px;
+                    font-size: 14px;
+                }
+                QPushButton:hover {
+                    background-color: #546E7A;
+                }
+                """
+            )
+            batch_layout.addWidget(button)
+        self.encodeFileButton.clicked.connect(lambda: self.convert_file("encode"))
+        self.decodeFileButton.clicked.connect(lambda: self.convert_file("decode"))
+
+        main_layout.addLayout(batch_layout)
+
+        self.batchStatusLabel = QLabel("")
+        self.batchStatusLabel.setWordWrap(True)
+        self.batchStatusLabel.setStyleSheet("font-size: 13px; color: #555;")
+        main_layout.addWidget(self.batchStatusLabel)
+
         # Output display field for result
         self.outputField = QTextEdit()
         self.outputField.setReadOnly(True)
@@ -108,6 +167,14 @@ class urlEncoderDecoderApp(QMainWindow):
         )
         main_layout.addWidget(self.outputField)
 
+        # Component table for full-URL mode
+        self.componentTable = QTableWidget(0, len(URL_COLUMNS))
+        self.componentTable.setHorizontalHeaderLabels(URL_COLUMNS)
+        self.componentTable.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.componentTable.setStyleSheet("font-size: 13px;")
+        self.componentTable.hide()
+        main_layout.addWidget(self.componentTable)
+
         # Horizontal layout for Copy and Save buttons
         btn_layout = QHBoxLayout()
         btn_layout.setSpacing(10)
@@ -155,15 +222,59 @@ class urlEncoderDecoderApp(QMainWindow):
         # Set application font
         self.setFont(QFont("Arial", 10))
 
+    def toggle_full_url_mode(self, enabled):
+        self.componentTable.setVisible(enabled)
+        if not enabled:
+            self.componentTable.setRowCount(0)
+
+    def convert_full_urls(self, text, mode):
+        # Parsing thousands of pasted URLs happens on a worker
+        self.encodeButton.setEnabled(False)
+        self.decodeButton.setEnabled(False)
+        self.urlWorker = run_in_background(
+            process_urls,
+            text.splitlines(),
+            mode,
+            on_finished=self.full_urls_converted,
+            on_failed=self.full_urls_failed,
+        )
+
+    def full_urls_converted(self, rows):
+        self.encodeButton.setEnabled(True)
+        self.decodeButton.setEnabled(True)
+        self.outputField.setPlainText("\n".join(result for result, _, _ in rows))
+        shown = rows[:MAX_TABLE_ROWS]
+        self.componentTable.setUpdatesEnabled(False)
+        self.componentTable.setRowCount(len(shown))
+        for row, (_, components, error) in enumerate(shown):
+            if error:
+                item = QTableWidgetItem(f"Error: {error}")
+                self.componentTable.setItem(row, 0, item)
+                continue
+            for column, value in enumerate(components):
+                self.componentTable.setItem(row, column, QTableWidgetItem(value))
+        self.componentTable.setUpdatesEnabled(True)
+        self.componentTable.resizeColumnsToContents()
+
+    def full_urls_failed(self, error):
+        self.encodeButton.setEnabled(True)
+        self.decodeButton.setEnabled(True)
+        QMessageBox.critical(
+            self, "URL Error", f"An error occurred while parsing URLs:\n{error}"
+        )
+
     def perform_encode(self):
-        text = self.inputField.text().strip()
+        text = self.inputField.toPlainText().strip()
         if not text:
             QMessageBox.warning(
                 self, "Input Error", "Please enter a URL string to encode."
             )
             return
+        if self.fullUrlCheckBox.isChecked():
+            self.convert_full_urls(text, "encode")
+            return
         try:
-            result = url_encode(text)
+            result = "\n".join(url_encode(line) for line in text.splitlines())
             self.outputField.setPlainText(result)
         except Exception as e:
             QMessageBox.critical(
@@ -173,14 +284,17 @@ class urlEncoderDecoderApp(QMainWindow):
             )
 
     def perform_decode(self):
-        text = self.inputField.text().strip()
+        text = self.inputField.toPlainText().strip()
         if not text:
             QMessageBox.warning(
                 self, "Input Error", "Please enter a URL string to decode."
             )
             return
+        if self.fullUrlCheckBox.isChecked():
+            self.convert_full_urls(text, "decode")
+            return
         try:
-            result = url_decode(text)
+            result = "\n".join(url_decode(line) for line in text.splitlines())
             self.outputField.setPlainText(result)
         except Exception as e:
             QMessageBox.critical(
@@ -189,6 +303,44 @@ class urlEncoderDecoderApp(QMainWindow):
                 f"An error occurred while decoding:\n{str(e)}\n{traceback.format_exc()}",
             )
 
+    def convert_file(self, mode):
+        input_path, _ = QFileDialog.getOpenFileName(
+            self, "Select URL List", "", "Text Files (*.txt);;All Files (*)"
+        )
+        if not input_path:
+            return
+        output_path, _ = QFileDialog.getSaveFileName(
+            self, "Save Converted URLs", "", "Text Files (*.txt);;All Files (*)"
+        )
+        if not output_path:
+            return
+        self.encodeFileButton.setEnabled(False)
+        self.decodeFileButton.setEnabled(False)
+        self.batchStatusLabel.setText(f"Processing {input_path}...")
+        self.batchWorker = run_in_background(
+            convert_url_file,
+            input_path,
+            output_path,
+            mode,
+            on_finished=self.batch_finished,
+            on_failed=self.batch_failed,
+        )
+
+    def batch_finished(self, result):
+        self.encodeFileButton.setEnabled(True)
+        self.decodeFileButton.setEnabled(True)
+        report_batch(self, self.batchStatusLabel, "URLs", *result)
+
+    def batch_failed(self, error):
+        self.encodeFileButton.setEnabled(True)
+        self.decodeFileButton.setEnabled(True)
+        self.batchStatusLabel.setText("Batch conversion failed.")
+        QMessageBox.critical(
+            self,
+            "Batch Conversion",
+            f"An error occurred during batch conversion:\n{error}",
+        )
+
     def copy_result(self):
         result_text = self.outputField.toPlainText()
         if not result_text:
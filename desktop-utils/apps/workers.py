@@ -0,0 +1,36 @@
+import traceback
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+class WorkerSignals(QObject):
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+
+class FunctionWorker(QRunnable):
+    # Runs function(*args) on the global thread pool and reports back through
+    # signals. Connect them to methods of a widget so the slots run on the
+    # GUI thread (plain functions would run on the worker thread).
+    def __init__(self, function, *args):
+        super().__init__()
+        self.function = function
+        self.args = args
+        self.signals = WorkerSignals()
+
+    def run(self):
+        try:
+            result = self.function(*self.args)
+        except Exception:
+            self.signals.failed.emit(traceback.format_exc())
+            return
+        self.signals.finished.emit(result)
+
+
+def run_in_background(function, *args, on_finished=None, on_failed=None):
+    worker = FunctionWorker(function, *args)
+    if on_finished is not None:
+        worker.signals.finished.connect(on_finished)
+    if on_failed is not None:
+        worker.signals.failed.connect(on_failed)
+    QThreadPool.globalInstance().start(worker)
+    return worker
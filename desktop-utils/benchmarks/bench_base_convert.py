@@ -0,0 +1,61 @@
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import apps.base_engine as base_engine  # noqa: E402
+from apps.base_engine import format_int, parse_int  # noqa: E402
+
+# Decimal and hex conversion of huge integers against Python's int()/str(),
+# which are quadratic for decimal. Pass --no-baseline to skip the slow
+# built-ins past 100k digits and --no-gmpy2 to time the pure-Python paths.
+
+SIZES = [1000, 10000, 100000, 1000000]
+
+
+def measure(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def row(label, digits, elapsed, baseline=None):
+    speedup = f"  ({baseline / elapsed:.1f}x)" if baseline else ""
+    print(f"{label:<28} {digits:>9,} digits {elapsed:9.4f}s{speedup}")
+
+
+def main():
+    if "--no-gmpy2" in sys.argv:
+        base_engine.gmpy2 = None
+    skip_slow = "--no-baseline" in sys.argv
+    sys.set_int_max_str_digits(0)
+    random.seed(42)
+    print(f"gmpy2: {'yes' if base_engine.gmpy2 else 'no'}")
+    for digits in SIZES:
+        text = str(random.randint(1, 9)) + "".join(
+            random.choices("0123456789", k=digits - 1)
+        )
+        baseline = None
+        if not (skip_slow and digits > 100000):
+            baseline, value = measure(int, text)
+            row("int(str)", digits, baseline)
+        elapsed, value = measure(parse_int, text, 10)
+        row("parse_int decimal", digits, elapsed, baseline)
+
+        baseline = None
+        if not (skip_slow and digits > 100000):
+            baseline, _ = measure(str, value)
+            row("str(int)", digits, baseline)
+        elapsed, _ = measure(format_int, value, 10)
+        row("format_int decimal", digits, elapsed, baseline)
+
+        for radix in (16, 32, 36):
+            elapsed, _ = measure(format_int, value, radix)
+            row(f"format_int base {radix}", digits, elapsed)
+        print()
+
+
+if __name__ == "__main__":
+    main()
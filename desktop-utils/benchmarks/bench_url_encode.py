@@ -0,0 +1,60 @@
+import os
+import random
+import string
+import sys
+import time
+import urllib.parse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from apps.url_codec import get_encoder  # noqa: E402
+
+# Throughput of the lookup-table encoder against urllib's quote/quote_plus on
+# URL-like strings: some all-safe, most with spaces, reserved and non-ASCII.
+
+
+def build_inputs(count=200000):
+    random.seed(42)
+    words = ["search", "café", "a b", "x&y=z", "path/to", "100%", "日本", "ok"]
+    inputs = []
+    for _ in range(count):
+        if random.random() < 0.3:
+            inputs.append("".join(random.choices(string.ascii_lowercase, k=24)))
+        else:
+            inputs.append(" ".join(random.choices(words, k=4)))
+    return inputs
+
+
+def measure(label, func, inputs, baseline=None):
+    start = time.perf_counter()
+    func(inputs)
+    elapsed = time.perf_counter() - start
+    rate = len(inputs) / elapsed / 1e6
+    speedup = f"  ({baseline / elapsed:.1f}x)" if baseline else ""
+    print(f"{label:<34} {elapsed:7.3f}s  {rate:6.2f} M strings/s{speedup}")
+    return elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    inputs = build_inputs(count)
+    path = get_encoder("path")
+    form = get_encoder("form")
+
+    quote = measure(
+        "urllib.parse.quote", lambda xs: [urllib.parse.quote(x) for x in xs], inputs
+    )
+    measure("PercentEncoder path", lambda xs: [path(x) for x in xs], inputs, quote)
+    measure("PercentEncoder path, encode_lines", path.encode_lines, inputs, quote)
+
+    quote_plus = measure(
+        "urllib.parse.quote_plus",
+        lambda xs: [urllib.parse.quote_plus(x) for x in xs],
+        inputs,
+    )
+    measure("PercentEncoder form", lambda xs: [form(x) for x in xs], inputs, quote_plus)
+    measure("PercentEncoder form, encode_lines", form.encode_lines, inputs, quote_plus)
+
+
+if __name__ == "__main__":
+    main()
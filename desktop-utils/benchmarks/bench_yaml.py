@@ -0,0 +1,76 @@
+import io
+import sys
+import time
+import yaml
+
+# Compare the pure-Python PyYAML loader/dumper with the libyaml C bindings
+# on a multi-document manifest, the shape the Format Converter sees most.
+
+
+def build_manifest(documents=300):
+    docs = []
+    for i in range(documents):
+        docs.append(
+            {
+                "apiVersion": "apps/v1",
+                "kind": "Deployment",
+                "metadata": {
+                    "name": f"service-{i}",
+                    "labels": {"app": f"service-{i}", "tier": "backend"},
+                },
+                "spec": {
+                    "replicas": i % 5 + 1,
+                    "template": {
+                        "spec": {
+                            "containers": [
+                                {
+                                    "name": f"container-{j}",
+                                    "image": f"registry.local/app-{i}:{j}",
+                                    "ports": [{"containerPort": 8000 + j}],
+                                    "env": [
+                                        {"name": f"VAR_{k}", "value": str(k)}
+                                        for k in range(10)
+                                    ],
+                                }
+                                for j in range(3)
+                            ]
+                        }
+                    },
+                },
+            }
+        )
+    return yaml.dump_all(docs, Dumper=yaml.SafeDumper, default_flow_style=False)
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main():
+    documents = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    text = build_manifest(documents)
+    print(f"Manifest: {documents} documents, {len(text) / 1e6:.1f} MB")
+
+    if not yaml.__with_libyaml__:
+        print("PyYAML was built without libyaml; nothing to compare.")
+        return
+
+    py_load, docs = timed(lambda: list(yaml.load_all(text, Loader=yaml.SafeLoader)))
+    c_load, _ = timed(lambda: list(yaml.load_all(text, Loader=yaml.CSafeLoader)))
+    print(f"load   SafeLoader  {py_load:7.3f}s")
+    print(f"load   CSafeLoader {c_load:7.3f}s  ({py_load / c_load:.1f}x)")
+
+    py_dump, _ = timed(
+        lambda: yaml.dump_all(docs, io.StringIO(), Dumper=yaml.SafeDumper)
+    )
+    c_dump, _ = timed(
+        lambda: yaml.dump_all(docs, io.StringIO(), Dumper=yaml.CSafeDumper)
+    )
+    print(f"dump   SafeDumper  {py_dump:7.3f}s")
+    print(f"dump   CSafeDumper {c_dump:7.3f}s  ({py_dump / c_dump:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+import argparse
+import io
+import os
+import sys
+
+# Headless entry point: only Qt-free modules may be imported here so the
+# tools can run on servers without a display or PyQt5 installed.
+from apps.formats import (
+    INPUT_ENCODING,
+    FRAGMENT_WRITERS,
+    READERS,
+    WRITERS,
+    convert,
+    convert_csv_parallel,
+    format_for_path,
+    replacing_output,
+)
+
+
+def _open_stream(path, mode, binary):
+    encoding = INPUT_ENCODING if mode == "r" else "utf-8"
+    if path == "-":
+        stream = sys.stdin.buffer if mode == "r" else sys.stdout.buffer
+        if binary:
+            return stream
+        return io.TextIOWrapper(stream, encoding=encoding, newline="")
+    if binary:
+        return open(path, mode + "b")
+    return open(path, mode, encoding=encoding, newline="")
+
+
+def _resolve_format(explicit, path, option):
+    if explicit:
+        return explicit
+    if path == "-":
+        raise ValueError(f"{option} is required when reading or writing '-'")
+    return format_for_path(path)
+
+
+def run_convert(args):
+    source = _resolve_format(args.source, args.input, "--from")
+    target = _resolve_format(args.target, args.output, "--to")
+    if args.jobs > 1 and source == "CSV" and target in FRAGMENT_WRITERS:
+        if "-" in (args.input, args.output):
+            raise ValueError("--jobs needs real input and output files")
+        convert_csv_parallel(args.input, target, args.output, jobs=args.jobs)
+        return
+    input_file = _open_stream(args.input, "r", READERS[source].binary)
+    try:
+        if args.output == "-":
+            output_file = _open_stream(args.output, "w", WRITERS[target].binary)
+            try:
+                convert(source, input_file, target, output_file)
+                output_file.flush()
+            finally:
+                # Leave the process-wide stdout stream open
+                if isinstance(output_file, io.TextIOWrapper):
+                    output_file.detach()
+        else:
+            with replacing_output(args.output, WRITERS[target].binary) as output_file:
+                convert(source, input_file, target, output_file)
+    finally:
+        # Leave the process-wide stdin stream open
+        if args.input != "-":
+            input_file.close()
+        elif isinstance(input_file, io.TextIOWrapper):
+            input_file.detach()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="desktop-utils", description="Desktop-Utils command line tools."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    convert_parser = commands.add_parser(
+        "convert", help="Convert between JSON, CSV, YAML, Parquet and Arrow."
+    )
+    convert_parser.add_argument("input", help="Input file, or - for stdin")
+    convert_parser.add_argument("output", help="Output file, or - for stdout")
+    convert_parser.add_argument(
+        "--from",
+        dest="source",
+        choices=list(READERS),
+        help="Input format (default: guessed from the file extension)",
+    )
+    convert_parser.add_argument(
+        "--to",
+        dest="target",
+        choices=list(WRITERS),
+        help="Output format (default: guessed from the file extension)",
+    )
+    convert_parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes for parsing CSV input into JSON or YAML",
+    )
+    convert_parser.set_defaults(handler=run_convert)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        args.handler(args)
+    except BrokenPipeError:
+        # The reader went away (e.g. piped into head); silence the final
+        # flush of stdout at interpreter exit
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    except Exception as e:
+        print(f"desktop-utils {args.command}: error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Tests import the tools as `apps.…`, like main.py and cli.py do
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
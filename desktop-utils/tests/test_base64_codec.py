@@ -0,0 +1,52 @@
+import base64
+import json
+import os
+
+import pytest
+
+from apps import base64_codec
+
+
+def test_bundle_keys_are_distinct():
+    keys = base64_codec.bundle_keys(["a.png", "a-png", "a.png.2", "b/a.png"])
+    assert keys == {
+        "a.png": "a-png",
+        "a-png": "a-png-3",
+        "a.png.2": "a-png-2",
+        "b/a.png": "b-a-png",
+    }
+
+
+@pytest.mark.parametrize("output_format", ["json", "css"])
+def test_bundle_rebuild_reuses_unchanged_files(tmp_path, output_format):
+    assets = tmp_path / "assets"
+    assets.mkdir()
+    (assets / "a.png").write_bytes(b"\x89PNG\r\n\x1a\nfirst")
+    (assets / "a-png").write_bytes(b"second")
+    (assets / "c.txt").write_bytes(b"third")
+    output_path = str(tmp_path / f"bundle.{output_format}")
+
+    assert base64_codec.build_data_uri_bundle(
+        str(assets), output_path, output_format
+    ) == (3, 0)
+    with open(output_path + ".cache.json", encoding="utf-8") as cache_file:
+        cache = json.load(cache_file)
+    assert all(
+        sorted(entry) == ["mtime_ns", "sha256", "size"] for entry in cache.values()
+    )
+
+    # Touched with the same content, changed, and unchanged
+    os.utime(assets / "a.png", ns=(1, 1))
+    (assets / "c.txt").write_bytes(b"changed")
+    with open(output_path, encoding="utf-8") as bundle:
+        before = bundle.read()
+    assert base64_codec.build_data_uri_bundle(
+        str(assets), output_path, output_format
+    ) == (1, 2)
+    with open(output_path, encoding="utf-8") as bundle:
+        after = bundle.read()
+
+    encoded = base64.b64encode(b"changed").decode("ascii")
+    assert after == before.replace(base64.b64encode(b"third").decode("ascii"), encoded)
+    if output_format == "css":
+        assert "--a-png: url(" in after and "--a-png-2: url(" in after
@@ -0,0 +1,21 @@
+import random
+
+import pytest
+
+from apps import base_engine
+
+
+@pytest.mark.parametrize("base", ["Base 36", "Base 7", "Base58", "Decimal"])
+def test_format_int_without_gmpy2(monkeypatch, base):
+    monkeypatch.setattr(base_engine, "gmpy2", None)
+    monkeypatch.setattr(base_engine, "DECIMAL_THRESHOLD_BITS", 1 << 12)
+    monkeypatch.setattr(base_engine, "DECIMAL_DIVISION_THRESHOLD_BITS", 1 << 12)
+    radix, alphabet = base_engine._alphabet(base_engine.BASE_MAP[base])
+    rng = random.Random(base)
+    for bits in (1, 4000, 5000, 40000):
+        value = rng.getrandbits(bits) | 1 << (bits - 1)
+        expected = base_engine._format_digits(value, radix, alphabet)
+        assert base_engine.format_int(value, base_engine.BASE_MAP[base]) == expected
+        assert base_engine.format_int(-value, base_engine.BASE_MAP[base]) == (
+            "-" + expected
+        )
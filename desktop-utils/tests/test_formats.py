@@ -0,0 +1,173 @@
+import io
+import json
+
+import pytest
+
+from apps import formats
+
+
+@pytest.mark.parametrize(
+    "target, extension", [("Parquet", "parquet"), ("Arrow", "arrow")]
+)
+def test_columnar_writers_stream_several_batches(
+    tmp_path, monkeypatch, target, extension
+):
+    pytest.importorskip("pyarrow")
+    monkeypatch.setattr(formats, "BATCH_SIZE", 10)
+    records = [{"id": i, "name": f"row {i}"} for i in range(25)]
+    input_path = tmp_path / "input.json"
+    output_path = tmp_path / f"output.{extension}"
+    back_path = tmp_path / "back.json"
+    with open(input_path, "w", encoding="utf-8") as input_file:
+        formats.write_json(records, input_file)
+
+    formats.convert_file("JSON", input_path, target, output_path)
+    formats.convert_file(target, output_path, "JSON", back_path)
+
+    with open(back_path, encoding="utf-8") as back_file:
+        assert list(formats.read_json(back_file)) == records
+
+
+def test_failed_conversion_keeps_existing_output(tmp_path):
+    input_path = tmp_path / "input.json"
+    output_path = tmp_path / "output.csv"
+    input_path.write_text("[1, 2]", encoding="utf-8")
+    output_path.write_text("previous\n", encoding="utf-8")
+
+    with pytest.raises(ValueError):
+        formats.convert_file("JSON", input_path, "CSV", output_path)
+
+    assert output_path.read_text(encoding="utf-8") == "previous\n"
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "input.json",
+        "output.csv",
+    ]
+
+
+def test_convert_file_onto_itself(tmp_path):
+    path = tmp_path / "data.json"
+    path.write_text('[{"a": 1}, {"a": 2}]', encoding="utf-8")
+
+    formats.convert_file("JSON", path, "JSON", path)
+
+    with open(path, encoding="utf-8") as json_file:
+        assert list(formats.read_json(json_file)) == [{"a": 1}, {"a": 2}]
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("[]", []),
+        (' [1, {"a": [2]}, "x"] \n', [1, {"a": [2]}, "x"]),
+        ('{"a": 1}\n{"a": 2}\n', [{"a": 1}, {"a": 2}]),
+    ],
+)
+def test_read_json_values(text, expected):
+    assert list(formats.read_json(io.StringIO(text))) == expected
+
+
+@pytest.mark.parametrize(
+    "text", ["[1,2] garbage", "[1,2]\n[3]", "[1,]", "[,1]", "[1 2]", "[1,2"]
+)
+def test_read_json_rejects_malformed_arrays(text):
+    with pytest.raises(ValueError):
+        list(formats.read_json(io.StringIO(text)))
+
+
+@pytest.mark.parametrize(
+    "records",
+    [
+        [{"id": i, "text": "x" * i} for i in range(200)],
+        [1.5e-7 * i for i in range(200)] + [12345, -0.25e3, 1e300, -7, 0.5],
+    ],
+)
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 11])
+def test_read_json_across_chunks(records, chunk_size):
+    text = json.dumps(records)
+    values = formats._iter_json_values(io.StringIO(text), chunk_size=chunk_size)
+    assert list(values) == records
+
+
+def test_read_ndjson_numbers_across_chunks():
+    text = "1.25e-3\n-42\n3.5E+2\n"
+    values = formats._iter_json_values(io.StringIO(text), chunk_size=2)
+    assert list(values) == [1.25e-3, -42, 350.0]
+
+
+def test_convert_csv_parallel_matches_sequential(tmp_path):
+    rows = [f'{i},"line {i}\nwith ""quotes"", commas"' for i in range(300)]
+    input_path = tmp_path / "input.csv"
+    input_path.write_text("id,text\n" + "\n".join(rows) + "\n", encoding="utf-8")
+    parallel_path = tmp_path / "parallel.json"
+    sequential_path = tmp_path / "sequential.json"
+
+    formats.convert_csv_parallel(
+        input_path, "JSON", parallel_path, jobs=2, chunk_size=1024
+    )
+    formats.convert_file("CSV", input_path, "JSON", sequential_path)
+
+    assert parallel_path.read_text(encoding="utf-8") == sequential_path.read_text(
+        encoding="utf-8"
+    )
+
+
+def test_convert_csv_parallel_falls_back_on_stray_quotes(tmp_path):
+    # The bare quote in '12" pipe' flips the quote parity, so the split lands
+    # inside the quoted multi-line fields that follow
+    rows = ['0,12" pipe'] + [f'{i},"line {i}\nnext"' for i in range(1, 300)]
+    input_path = tmp_path / "input.csv"
+    input_path.write_text("id,text\n" + "\n".join(rows) + "\n", encoding="utf-8")
+    parallel_path = tmp_path / "parallel.json"
+    sequential_path = tmp_path / "sequential.json"
+
+    formats.convert_csv_parallel(
+        input_path, "JSON", parallel_path, jobs=2, chunk_size=1024
+    )
+    formats.convert_file("CSV", input_path, "JSON", sequential_path)
+
+    assert parallel_path.read_text(encoding="utf-8") == sequential_path.read_text(
+        encoding="utf-8"
+    )
+
+
+@pytest.mark.parametrize(
+    "target, extension", [("Parquet", "parquet"), ("Arrow", "arrow")]
+)
+def test_columnar_writers_keep_every_key(tmp_path, monkeypatch, target, extension):
+    pytest.importorskip("pyarrow")
+    monkeypatch.setattr(formats, "BATCH_SIZE", 2)
+    input_path = tmp_path / "input.json"
+    output_path = tmp_path / f"output.{extension}"
+    back_path = tmp_path / "back.json"
+
+    input_path.write_text('[{"id": 1}, {"id": 2, "email": "x@y"}]', encoding="utf-8")
+    formats.convert_file("JSON", input_path, target, output_path)
+    formats.convert_file(target, output_path, "JSON", back_path)
+    with open(back_path, encoding="utf-8") as back_file:
+        assert list(formats.read_json(back_file)) == [
+            {"id": 1, "email": None},
+            {"id": 2, "email": "x@y"},
+        ]
+
+    # A key first seen after the first batch cannot be added to the schema
+    input_path.write_text(
+        '[{"id": 1}, {"id": 2}, {"id": 3, "email": "x@y"}]', encoding="utf-8"
+    )
+    with pytest.raises(ValueError, match="email"):
+        formats.convert_file("JSON", input_path, target, output_path)
+
+
+def test_csv_byte_order_mark_is_dropped_on_every_path(tmp_path):
+    input_path = tmp_path / "input.csv"
+    input_path.write_bytes(b"\xef\xbb\xbfid,name\n1,a\n2,b\n")
+    sequential_path = tmp_path / "sequential.json"
+    parallel_path = tmp_path / "parallel.json"
+
+    formats.convert_file("CSV", input_path, "JSON", sequential_path)
+    formats.convert_csv_parallel(input_path, "JSON", parallel_path, jobs=2)
+
+    with open(sequential_path, encoding="utf-8") as json_file:
+        assert list(formats.read_json(json_file))[0] == {"id": "1", "name": "a"}
+    assert parallel_path.read_text(encoding="utf-8") == sequential_path.read_text(
+        encoding="utf-8"
+    )